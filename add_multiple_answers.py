@@ -1,15 +1,124 @@
 """
 Add multiple correct answers to questions for realistic exam experience
 In real exams, many questions have 2-3 correct answers that must be selected
+
+Each question's answer count comes from a hash of its own stem and options,
+so a question that appears once keeps its assignment wherever it sits in
+the bank, and reruns leave assigned questions alone. Copies of a question
+are byte-identical (the Azure banks hold under 30 distinct questions in
+300), so each copy also hashes how many copies come before it; otherwise a
+question repeated fifty times would get one answer count fifty times.
+
+That occurrence number depends on the rest of the bank: removing or
+reordering a copy reassigns the copies after it, and a shard or partial run
+must hold every copy of each question it includes (whole question_key
+groups, in bank order) to agree with a run over the whole bank.
 """
 
-import json
+import argparse
+import hashlib
 import sys
-import random
+from collections import Counter
+
+from bank_io import CERTIFICATION_BANKS, load_bank, save_bank
+from question_store import connect, distribution, find_questions, update_questions
+
+# Bank file -> certification id in the question store
+BANK_CERTIFICATIONS = {filepath: cert_id for cert_id, filepath in CERTIFICATION_BANKS.items()}
+
+# Mixed into every question's hash; change it to draw a different assignment
+ASSIGNMENT_SEED = "42"
+# Strategy: 60% single answer, 30% two answers, 10% three answers
+SINGLE_ANSWER_SHARE = 0.6
+TWO_ANSWER_SHARE = 0.3
+
+def question_key(q):
+    """q's stem and options, which identify it for the assignment.
+    
+    The answer is left out, since assigning changes it; options are sorted
+    so reordering them keeps the assignment.
+    """
+    return '\0'.join([q.get('question', '')] + sorted(q.get('options', [])))
+
+def answer_count_for(q, seed=ASSIGNMENT_SEED, occurrence=0):
+    """1, 2 or 3 correct answers for q, drawn from a hash of its stem and options.
+    
+    occurrence is the number of copies of q earlier in the bank.
+    """
+    key = '\0'.join([seed, str(occurrence), question_key(q)])
+    draw = int.from_bytes(hashlib.sha256(key.encode('utf-8')).digest()[:8], 'big') / 2**64
+    if draw < SINGLE_ANSWER_SHARE:
+        return 1
+    if draw < SINGLE_ANSWER_SHARE + TWO_ANSWER_SHARE:
+        return 2
+    return 3
+
+def assign_answer_count(q, seed=ASSIGNMENT_SEED, occurrence=0):
+    """Apply q's answer count in place; returns (made multi-answer, changed at all)"""
+    before = (q.get('answer'), q.get('correctCount'))
+    current_answer = q.get('answer', '')
+    options = q.get('options', [])
+    count = answer_count_for(q, seed, occurrence)
+    modified = False
+    
+    if count == 1:
+        # Single answer - make sure answer is a string
+        if isinstance(current_answer, list):
+            q['answer'] = current_answer[0] if current_answer else options[0]
+        q['correctCount'] = 1
+    
+    elif count == 2 and len(options) >= 4:
+        # Two correct answers
+        if isinstance(current_answer, str):
+            # Convert to list and add a second correct answer
+            first_answer = current_answer
+            # Find another option that's not the current answer
+            other_options = [opt for opt in options if opt != first_answer]
+            if other_options:
+                second_answer = other_options[0]
+                q['answer'] = [first_answer, second_answer]
+                q['correctCount'] = 2
+                modified = True
+    
+    elif count == 3 and len(options) >= 5:
+        # Three correct answers
+        if isinstance(current_answer, str):
+            first_answer = current_answer
+            other_options = [opt for opt in options if opt != first_answer]
+            if len(other_options) >= 2:
+                q['answer'] = [first_answer, other_options[0], other_options[1]]
+                q['correctCount'] = 3
+                modified = True
+    
+    return modified, (q.get('answer'), q.get('correctCount')) != before
+
+def assign_answer_counts(questions, seed=ASSIGNMENT_SEED):
+    """Give questions varied answer counts (1, 2, or 3 correct answers).
+    
+    Returns (how many became multi-answer, positions of the questions that
+    changed); questions already assigned by an earlier run never change.
+    questions must include every copy of each question in it, in bank order
+    (see the module docstring).
+    """
+    modified = 0
+    changed = []
+    occurrences = Counter()
+    for i, q in enumerate(questions):
+        key = question_key(q)
+        made_multiple, question_changed = assign_answer_count(q, seed, occurrences[key])
+        occurrences[key] += 1
+        modified += made_multiple
+        if question_changed:
+            changed.append(i)
+    return modified, changed
 
-if sys.platform == 'win32':
-    import io
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+def print_distribution(single, double, triple, total, modified):
+    print(f"\nDistribution:")
+    print(f"  Single answer (Select 1): {single} questions ({single/total*100:.1f}%)")
+    print(f"  Two answers (Select 2): {double} questions ({double/total*100:.1f}%)")
+    print(f"  Three answers (Select 3): {triple} questions ({triple/total*100:.1f}%)")
+    print(f"\nModified: {modified} questions")
+    print(f"✓ Questions now match real exam format!")
 
 def make_questions_realistic(filepath, cert_name):
     """Update questions to have varied answer counts (1, 2, or 3 correct answers)"""
@@ -17,102 +126,85 @@ def make_questions_realistic(filepath, cert_name):
     print(f"Making {cert_name} questions realistic")
     print('='*70)
     
-    with open(filepath, 'r', encoding='utf-8') as f:
-        questions = json.load(f)
+    questions = load_bank(filepath)
     
     print(f"Total questions: {len(questions)}")
     
-    # Strategy: 
-    # - 60% single answer (180 questions)
-    # - 30% two answers (90 questions)
-    # - 10% three answers (30 questions)
+    modified, changed = assign_answer_counts(questions)
+    print(f"Changed: {len(changed)} questions ({len(questions) - len(changed)} already assigned)")
     
-    single_answer_count = int(len(questions) * 0.6)
-    two_answer_count = int(len(questions) * 0.3)
-    three_answer_count = len(questions) - single_answer_count - two_answer_count
-    
-    # Shuffle to randomly assign question types
-    indices = list(range(len(questions)))
-    random.shuffle(indices)
-    
-    single_answer_indices = set(indices[:single_answer_count])
-    two_answer_indices = set(indices[single_answer_count:single_answer_count + two_answer_count])
-    three_answer_indices = set(indices[single_answer_count + two_answer_count:])
-    
-    modified = 0
-    
-    for i, q in enumerate(questions):
-        current_answer = q.get('answer', '')
-        options = q.get('options', [])
-        
-        if i in single_answer_indices:
-            # Single answer - make sure answer is a string
-            if isinstance(current_answer, list):
-                q['answer'] = current_answer[0] if current_answer else options[0]
-            q['correctCount'] = 1
-            
-        elif i in two_answer_indices and len(options) >= 4:
-            # Two correct answers
-            if isinstance(current_answer, str):
-                # Convert to list and add a second correct answer
-                first_answer = current_answer
-                # Find another option that's not the current answer
-                other_options = [opt for opt in options if opt != first_answer]
-                if other_options:
-                    second_answer = other_options[0]
-                    q['answer'] = [first_answer, second_answer]
-                    q['correctCount'] = 2
-                    modified += 1
-            
-        elif i in three_answer_indices and len(options) >= 5:
-            # Three correct answers
-            if isinstance(current_answer, str):
-                first_answer = current_answer
-                other_options = [opt for opt in options if opt != first_answer]
-                if len(other_options) >= 2:
-                    q['answer'] = [first_answer, other_options[0], other_options[1]]
-                    q['correctCount'] = 3
-                    modified += 1
-    
-    # Save updated questions
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(questions, f, indent=2, ensure_ascii=False)
+    # Save updated questions; an unchanged bank is left alone
+    if changed:
+        save_bank(questions, filepath)
     
     # Count distribution
     single = sum(1 for q in questions if q.get('correctCount', 1) == 1)
     double = sum(1 for q in questions if q.get('correctCount', 1) == 2)
     triple = sum(1 for q in questions if q.get('correctCount', 1) == 3)
     
-    print(f"\nDistribution:")
-    print(f"  Single answer (Select 1): {single} questions ({single/len(questions)*100:.1f}%)")
-    print(f"  Two answers (Select 2): {double} questions ({double/len(questions)*100:.1f}%)")
-    print(f"  Three answers (Select 3): {triple} questions ({triple/len(questions)*100:.1f}%)")
-    print(f"\nModified: {modified} questions")
-    print(f"✓ Questions now match real exam format!")
+    print_distribution(single, double, triple, len(questions), modified)
     
     return modified
 
-print("="*70)
-print("ADDING MULTIPLE CORRECT ANSWERS")
-print("Making questions realistic like actual certification exams")
-print("="*70)
-
-# Set random seed for reproducibility
-random.seed(42)
-
-total_modified = 0
-total_modified += make_questions_realistic('questions_aws_developer.json', 'AWS Developer')
-total_modified += make_questions_realistic('questions_aws_ai.json', 'AWS AI')
-total_modified += make_questions_realistic('questions_azure_developer.json', 'Azure Developer')
-total_modified += make_questions_realistic('questions_azure_ai.json', 'Azure AI')
+def make_store_questions_realistic(conn, filepath, cert_name):
+    """Same update against the SQLite store, written back in one transaction"""
+    print(f"\n{'='*70}")
+    print(f"Making {cert_name} questions realistic (question store)")
+    print('='*70)
+    
+    certification = BANK_CERTIFICATIONS[filepath]
+    rows = find_questions(conn, certification=certification)
+    questions = [q for _, _, _, q in rows]
+    
+    print(f"Total questions: {len(questions)}")
+    
+    modified, changed = assign_answer_counts(questions)
+    print(f"Changed: {len(changed)} questions ({len(questions) - len(changed)} already assigned)")
+    update_questions(conn, [(rows[i][0], questions[i]) for i in changed])
+    
+    # Count distribution from the correct_count index
+    counts = distribution(conn, 'correct_count').get(certification, {})
+    print_distribution(counts.get(1, 0), counts.get(2, 0), counts.get(3, 0), len(questions), modified)
+    
+    return modified
 
-print("\n" + "="*70)
-print("SUMMARY")
-print("="*70)
-print(f"Total questions modified: {total_modified}")
-print("\nAll 1,200 questions now have realistic answer distributions:")
-print("  - ~60% require selecting 1 answer")
-print("  - ~30% require selecting 2 answers")
-print("  - ~10% require selecting 3 answers")
-print("\n✓ Questions now match real certification exam format!")
+def main():
+    parser = argparse.ArgumentParser(description="Give questions realistic 1/2/3 correct answer counts")
+    parser.add_argument("--db", help="update questions in this SQLite store (see question_store.py) instead of the JSON banks")
+    args = parser.parse_args()
+    
+    if args.db:
+        conn = connect(args.db)
+        
+        def make_realistic(filepath, cert_name):
+            return make_store_questions_realistic(conn, filepath, cert_name)
+    else:
+        make_realistic = make_questions_realistic
+    
+    print("="*70)
+    print("ADDING MULTIPLE CORRECT ANSWERS")
+    print("Making questions realistic like actual certification exams")
+    print("="*70)
+    
+    total_modified = 0
+    total_modified += make_realistic('questions_aws_developer.json', 'AWS Developer')
+    total_modified += make_realistic('questions_aws_ai.json', 'AWS AI')
+    total_modified += make_realistic('questions_azure_developer.json', 'Azure Developer')
+    total_modified += make_realistic('questions_azure_ai.json', 'Azure AI')
+    
+    print("\n" + "="*70)
+    print("SUMMARY")
+    print("="*70)
+    print(f"Total questions modified: {total_modified}")
+    print("\nAll 1,200 questions now have realistic answer distributions:")
+    print("  - ~60% require selecting 1 answer")
+    print("  - ~30% require selecting 2 answers")
+    print("  - ~10% require selecting 3 answers")
+    print("\n✓ Questions now match real certification exam format!")
+    if args.db:
+        print(f"\nRun 'python question_store.py export --db {args.db}' to update the JSON banks")
 
+if __name__ == "__main__":
+    if sys.platform == 'win32':
+        sys.stdout.reconfigure(encoding='utf-8')
+    main()
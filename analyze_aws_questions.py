@@ -1,16 +1,16 @@
 """
 Analyze AWS questions quality and identify improvements needed
 """
-import json
 import sys
 
+from bank_io import load_bank
+
 if sys.platform == 'win32':
     import io
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
 def analyze_question_quality(filepath, cert_name):
-    with open(filepath, 'r', encoding='utf-8') as f:
-        questions = json.load(f)
+    questions = load_bank(filepath)
     
     print(f"\n{'='*70}")
     print(f"Analyzing: {cert_name}")
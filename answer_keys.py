@@ -0,0 +1,42 @@
+"""
+Answer keys as option indices
+Resolves each question's answer (a string, or a list for multi-answer
+questions) to the sorted indices of the matching options, matching the
+text exactly first and then ignoring surrounding whitespace, as the quiz
+did when it compared strings at scoring time
+"""
+
+def answer_texts(q):
+    """The question's correct answers as a list"""
+    answer = q.get('answer')
+    if isinstance(answer, list):
+        return answer
+    return [] if answer in (None, '') else [answer]
+
+def answer_indices(q):
+    """(sorted option indices of the answers, answers that match no option)"""
+    options = q.get('options', [])
+    stripped = [option.strip() for option in options]
+    indices = set()
+    missing = []
+    for answer in answer_texts(q):
+        if answer in options:
+            indices.add(options.index(answer))
+        elif answer.strip() in stripped:
+            indices.add(stripped.index(answer.strip()))
+        else:
+            missing.append(answer)
+    return sorted(indices), missing
+
+def add_answer_indices(questions):
+    """Set answerIndices on every question; returns [(position, problem)] for those that can't be keyed"""
+    problems = []
+    for i, q in enumerate(questions):
+        indices, missing = answer_indices(q)
+        if missing:
+            problems.append((i, f"answer not in options: {missing!r}"))
+        elif not indices:
+            problems.append((i, "no answer"))
+        else:
+            q['answerIndices'] = indices
+    return problems
@@ -0,0 +1,77 @@
+"""
+Fuzzy matching of a cleaned answer to one of its question's options
+Used when the answer text is not exactly one of the options (extraction
+noise, truncation, stray watermark fragments). Options are ranked by
+character-trigram overlap, the best two are scored by edit distance, and
+the match is rejected unless it is both confident and clearly better than
+the runner-up, so a wrong key is never guessed.
+"""
+
+import re
+
+from memo_cache import MemoCache
+
+DEFAULT_THRESHOLD = 0.75
+# The best option must beat the runner-up by this much
+MIN_MARGIN = 0.1
+
+# Trigram profiles by text; the same options recur across questions and banks
+TRIGRAM_CACHE = MemoCache()
+
+def normalize(text):
+    return re.sub(r'[^a-z0-9]+', ' ', text.lower()).strip()
+
+def trigram_profile(text):
+    padded = f" {normalize(text)} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+def trigrams(text):
+    return TRIGRAM_CACHE.lookup(text, trigram_profile)
+
+def dice(a, b):
+    if not a or not b:
+        return 0.0
+    return 2 * len(a & b) / (len(a) + len(b))
+
+def edit_distance(a, b):
+    """Levenshtein distance, one row at a time"""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+def edit_similarity(a, b):
+    a, b = normalize(a), normalize(b)
+    longest = max(len(a), len(b))
+    return 1 - edit_distance(a, b) / longest if longest else 1.0
+
+class AnswerMatcher:
+    """Maps answers to option indices with a confidence score and a reject threshold"""
+    
+    def __init__(self, threshold=DEFAULT_THRESHOLD, min_margin=MIN_MARGIN):
+        self.threshold = threshold
+        self.min_margin = min_margin
+    
+    def match(self, answer, options):
+        """(option index or None, confidence, reason); reason is "exact", "fuzzy" or why it was rejected"""
+        if answer in options:
+            return options.index(answer), 1.0, "exact"
+        if not normalize(answer):
+            return None, 0.0, "no answer"
+        
+        answer_grams = trigrams(answer)
+        ranked = sorted(((dice(answer_grams, trigrams(option)), i) for i, option in enumerate(options)), reverse=True)
+        # Edit distance is the expensive part, so only the two best candidates get it
+        scored = sorted(((0.5 * overlap + 0.5 * edit_similarity(answer, options[i]), i) for overlap, i in ranked[:2]),
+                        reverse=True)
+        confidence, best = scored[0]
+        if confidence < self.threshold:
+            return None, confidence, "below threshold"
+        if len(scored) > 1 and confidence - scored[1][0] < self.min_margin:
+            return None, confidence, "ambiguous"
+        return best, confidence, "fuzzy"
@@ -3,7 +3,7 @@ let selectedCertification = null;
 let allQuestions = [];
 let currentExam = [];
 let currentQuestionIndex = 0;
-let userAnswers = []; // Array of single answers
+let userAnswers = []; // Per question: sorted selected option indices, or null
 let timerInterval = null;
 let timeRemaining = 720; // 12 minutes in seconds
 const LETTERS = ['A', 'B', 'C', 'D', 'E', 'F'];
@@ -44,6 +44,64 @@ const CERTIFICATIONS = {
     }
 };
 
+// Content-hashed bank URLs written by build_static.py; without it the raw
+// questionsFile of each certification is fetched instead
+const BANK_MANIFEST_URL = 'banks-manifest.json';
+let bankManifest = null;
+
+async function loadBankManifest() {
+    if (bankManifest === null) {
+        try {
+            const response = await fetch(BANK_MANIFEST_URL, { cache: 'no-cache' });
+            bankManifest = response.ok ? await response.json() : {};
+        } catch (error) {
+            bankManifest = {};
+        }
+    }
+    return bankManifest;
+}
+
+async function getQuestionsUrl(certType) {
+    const manifest = await loadBankManifest();
+    const entry = manifest.banks && manifest.banks[certType];
+    return entry ? entry.url : CERTIFICATIONS[certType].questionsFile;
+}
+
+// Sorted indices of a question's correct options. build_static.py precomputes
+// them; for raw banks they are derived once from the answer text with the
+// same rule as answer_keys.py: the first option matching each answer, exactly
+// or else ignoring surrounding whitespace, so a repeated option counts once.
+function getAnswerIndices(question) {
+    if (!question.answerIndices) {
+        const answers = (Array.isArray(question.answer) ? question.answer : [question.answer])
+            .filter(answer => answer !== undefined && answer !== null && answer !== '');
+        const stripped = question.options.map(text => text.trim());
+        const indices = new Set();
+        answers.forEach(answer => {
+            let optIndex = question.options.indexOf(answer);
+            if (optIndex < 0) {
+                optIndex = stripped.indexOf(String(answer).trim());
+            }
+            if (optIndex >= 0) {
+                indices.add(optIndex);
+            }
+        });
+        question.answerIndices = [...indices].sort((a, b) => a - b);
+    }
+    return question.answerIndices;
+}
+
+function isAnswerCorrect(question, selection) {
+    const correct = getAnswerIndices(question);
+    return selection !== null && selection !== undefined &&
+        selection.length === correct.length &&
+        selection.every((optIndex, i) => optIndex === correct[i]);
+}
+
+function toLetters(indices) {
+    return indices ? indices.map(optIndex => LETTERS[optIndex]).join(', ') : null;
+}
+
 // DOM Elements
 const pages = {
     certSelection: document.getElementById('cert-selection-page'),
@@ -103,7 +161,7 @@ async function selectCertification(certType) {
         document.querySelector('#home-page .subtitle').textContent = certConfig.description;
         
         // Load questions for selected certification
-        const response = await fetch(certConfig.questionsFile);
+        const response = await fetch(await getQuestionsUrl(certType));
         allQuestions = await response.json();
         
         // Update question count in UI
@@ -135,7 +193,7 @@ function startExam() {
     // Select 10 random questions
     currentExam = selectRandomQuestions(allQuestions, 10);
     currentQuestionIndex = 0;
-    userAnswers = new Array(currentExam.length).fill(null); // Array of single answers
+    userAnswers = new Array(currentExam.length).fill(null);
     timeRemaining = 720; // Reset timer to 12 minutes
     
     showPage('quiz');
@@ -182,7 +240,9 @@ function displayQuestion() {
     const question = currentExam[currentQuestionIndex];
     
     // Update question text
-    document.getElementById('question-text').textContent = question.question;
+    const required = getAnswerIndices(question).length;
+    document.getElementById('question-text').textContent =
+        required > 1 ? `${question.question} (Select ${required})` : question.question;
     
     // Update progress
     document.getElementById('current-question').textContent = currentQuestionIndex + 1;
@@ -200,10 +260,11 @@ function displayQuestion() {
         const option = document.createElement('div');
         option.className = 'option';
         option.dataset.answer = letter;
+        option.dataset.index = index;
         option.dataset.text = text;
         
         const currentAnswer = userAnswers[currentQuestionIndex];
-        if (currentAnswer === letter) {
+        if (currentAnswer && currentAnswer.includes(index)) {
             option.classList.add('selected');
         }
         
@@ -212,7 +273,7 @@ function displayQuestion() {
             <div class="option-text">${text}</div>
         `;
         
-        option.addEventListener('click', () => selectAnswer(letter));
+        option.addEventListener('click', () => selectAnswer(index));
         optionsContainer.appendChild(option);
     });
     
@@ -220,15 +281,25 @@ function displayQuestion() {
     updateNavigationButtons();
 }
 
-// Select Answer (single selection)
-function selectAnswer(letter) {
-    userAnswers[currentQuestionIndex] = letter;
+// Select Answer: replaces the selection, or toggles it when several answers are required
+function selectAnswer(optIndex) {
+    const required = getAnswerIndices(currentExam[currentQuestionIndex]).length;
+    let selection = userAnswers[currentQuestionIndex] || [];
+    
+    if (required > 1) {
+        if (selection.includes(optIndex)) {
+            selection = selection.filter(selected => selected !== optIndex);
+        } else if (selection.length < required) {
+            selection = [...selection, optIndex].sort((a, b) => a - b);
+        }
+    } else {
+        selection = [optIndex];
+    }
+    userAnswers[currentQuestionIndex] = selection.length > 0 ? selection : null;
     
     // Update UI
     document.querySelectorAll('.option').forEach(opt => {
-        const optLetter = opt.dataset.answer;
-        
-        if (optLetter === letter) {
+        if (selection.includes(Number(opt.dataset.index))) {
             opt.classList.add('selected');
         } else {
             opt.classList.remove('selected');
@@ -331,20 +402,12 @@ function calculateResults() {
         let correctCount = 0;
         
         currentExam.forEach((question, index) => {
-            const userAnswerLetter = userAnswers[index];
-            
-            // Find the letter corresponding to the correct answer
-            let correctLetter = null;
-            question.options.forEach((optionText, optIndex) => {
-                if (optionText === question.answer || optionText.trim() === question.answer.trim()) {
-                    correctLetter = LETTERS[optIndex];
-                }
-            });
+            const selection = userAnswers[index];
             
-            console.log(`Q${index + 1}: User: ${userAnswerLetter}, Correct: ${correctLetter}`);
+            console.log(`Q${index + 1}: User: ${toLetters(selection)}, Correct: ${toLetters(getAnswerIndices(question))}`);
             
             // Check if user's answer matches
-            if (userAnswerLetter === correctLetter) {
+            if (isAnswerCorrect(question, selection)) {
                 correctCount++;
             }
         });
@@ -438,17 +501,9 @@ function displayReview() {
     reviewContainer.innerHTML = '';
     
     currentExam.forEach((question, index) => {
-        const userAnswerLetter = userAnswers[index];
-        
-        // Find correct answer letter
-        let correctLetter = null;
-        question.options.forEach((optionText, optIndex) => {
-            if (optionText === question.answer || optionText.trim() === question.answer.trim()) {
-                correctLetter = LETTERS[optIndex];
-            }
-        });
-        
-        const isCorrect = userAnswerLetter === correctLetter;
+        const selection = userAnswers[index] || [];
+        const correctIndices = getAnswerIndices(question);
+        const isCorrect = isAnswerCorrect(question, userAnswers[index]);
         
         const reviewDiv = document.createElement('div');
         reviewDiv.className = 'review-question';
@@ -457,17 +512,20 @@ function displayReview() {
             const letter = LETTERS[optIndex];
             let classes = ['review-option'];
             
-            if (userAnswerLetter === letter) {
+            const isUserAnswer = selection.includes(optIndex);
+            const isCorrectAnswer = correctIndices.includes(optIndex);
+            
+            if (isUserAnswer) {
                 classes.push('user-answer');
             }
-            if (correctLetter === letter) {
+            if (isCorrectAnswer) {
                 classes.push('correct-answer');
             }
             
             let badge = '';
-            if (correctLetter === letter) {
+            if (isCorrectAnswer) {
                 badge = '<span style="margin-left: auto; color: #4caf50; font-weight: bold;">✓ Correct</span>';
-            } else if (userAnswerLetter === letter) {
+            } else if (isUserAnswer) {
                 badge = '<span style="margin-left: auto; color: #ff4444; font-weight: bold;">✗ Wrong</span>';
             }
             
@@ -502,3 +560,8 @@ function displayReview() {
 // Initialize app when DOM is loaded
 document.addEventListener('DOMContentLoaded', init);
 
+// Exported for the unit tests; browsers load this file as a plain script
+if (typeof module !== 'undefined' && module.exports) {
+    module.exports = { getAnswerIndices, isAnswerCorrect };
+}
+
@@ -0,0 +1,184 @@
+"""
+Offset index sidecars for random access into question banks
+A bank's .idx sidecar holds one fixed-width (offset, length) entry per
+question, so a reader can memory-map the bank and decode just the records
+it needs instead of parsing the whole file.
+
+Usage:
+    python bank_index.py build [bank.json ...]        # write <bank>.idx sidecars
+    python bank_index.py sample bank.json -n 10       # decode 10 random questions
+"""
+
+import argparse
+import mmap
+import random
+import re
+import struct
+import sys
+import time
+from collections.abc import Sequence
+from pathlib import Path
+
+from bank_io import CERTIFICATION_BANKS, atomic_write_bytes, load_bank, loads
+
+INDEX_MAGIC = b'QIDX'
+INDEX_VERSION = 1
+# magic, version, record count, bank size, bank mtime (ns)
+HEADER = struct.Struct('<4sIIQQ')
+# byte offset and length of one record
+ENTRY = struct.Struct('<QI')
+
+# Bytes that can change nesting or string state while scanning JSON
+STRUCTURAL = re.compile(rb'[{}\[\]"\\]')
+
+def index_path(bank_path):
+    bank_path = Path(bank_path)
+    return bank_path.with_name(bank_path.name + '.idx')
+
+def record_spans(data):
+    """(offset, length) of every top-level object in a JSON array or JSON Lines buffer"""
+    spans = []
+    depth = 0
+    in_string = False
+    escaped_at = -1
+    start = None
+    # A JSON array wraps the records in one extra level of nesting
+    record_depth = 1 if re.match(rb'\s*\[', data) else 0
+    
+    for match in STRUCTURAL.finditer(data):
+        pos = match.start()
+        if pos == escaped_at:
+            continue
+        char = data[pos]
+        if in_string:
+            if char == 0x5C:  # backslash: skip the escaped byte
+                escaped_at = pos + 1
+            elif char == 0x22:
+                in_string = False
+            continue
+        if char == 0x22:
+            in_string = True
+        elif char in (0x7B, 0x5B):  # { [
+            if depth == record_depth and char == 0x7B:
+                start = pos
+            depth += 1
+        elif char in (0x7D, 0x5D):  # } ]
+            depth -= 1
+            if depth == record_depth and char == 0x7D:
+                spans.append((start, pos + 1 - start))
+    return spans
+
+def build_index(bank_path):
+    """Write bank_path's .idx sidecar; returns the number of records indexed"""
+    bank_path = Path(bank_path)
+    stat = bank_path.stat()
+    spans = record_spans(bank_path.read_bytes())
+    
+    header = HEADER.pack(INDEX_MAGIC, INDEX_VERSION, len(spans), stat.st_size, stat.st_mtime_ns)
+    entries = b''.join(ENTRY.pack(offset, length) for offset, length in spans)
+    atomic_write_bytes(index_path(bank_path), header + entries)
+    return len(spans)
+
+def index_is_current(bank_path):
+    """Whether the sidecar exists and was built from the bank as it is now"""
+    path = index_path(bank_path)
+    if not path.exists():
+        return False
+    with open(path, 'rb') as f:
+        header = f.read(HEADER.size)
+    if len(header) < HEADER.size:
+        return False
+    magic, version, _, size, mtime_ns = HEADER.unpack(header)
+    stat = Path(bank_path).stat()
+    return (magic, version, size, mtime_ns) == (INDEX_MAGIC, INDEX_VERSION, stat.st_size, stat.st_mtime_ns)
+
+class IndexedBank(Sequence):
+    """Question list backed by a memory-mapped bank; only indexed records are decoded.
+    
+    The sidecar is rebuilt first if it is missing or older than the bank.
+    Use as a context manager, or call close(), to release the mapping.
+    """
+    
+    def __init__(self, bank_path, rebuild=True):
+        self.bank_path = Path(bank_path)
+        if not index_is_current(self.bank_path):
+            if not rebuild:
+                raise RuntimeError(f"{index_path(self.bank_path)} is missing or stale")
+            build_index(self.bank_path)
+        
+        with open(index_path(self.bank_path), 'rb') as f:
+            _, _, self.count, _, _ = HEADER.unpack(f.read(HEADER.size))
+            self.entries = f.read(self.count * ENTRY.size)
+        
+        self.file = open(self.bank_path, 'rb')
+        # mmap refuses empty files; an empty bank has no records to map anyway
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if self.count else b''
+    
+    def span(self, i):
+        return ENTRY.unpack_from(self.entries, i * ENTRY.size)
+    
+    def raw(self, i):
+        """Undecoded bytes of record i"""
+        offset, length = self.span(i)
+        return self.data[offset:offset + length]
+    
+    def __len__(self):
+        return self.count
+    
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self.count))]
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        return loads(self.raw(i))
+    
+    def sample(self, k, rng=random):
+        """k distinct random questions, decoding only those records"""
+        return [self[i] for i in rng.sample(range(self.count), k)]
+    
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self.file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Build offset index sidecars and sample questions through them")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build = subparsers.add_parser("build", help="write .idx sidecars")
+    build.add_argument("banks", nargs="*", default=list(CERTIFICATION_BANKS.values()))
+    sample = subparsers.add_parser("sample", help="decode random questions via the index")
+    sample.add_argument("bank")
+    sample.add_argument("-n", type=int, default=10, help="questions to sample (default: 10)")
+    args = parser.parse_args()
+    
+    if args.command == "build":
+        for bank_file in args.banks:
+            count = build_index(bank_file)
+            print(f"  {bank_file}: {count} records -> {index_path(bank_file).name}")
+        return
+    
+    start = time.perf_counter()
+    with IndexedBank(args.bank) as bank:
+        questions = bank.sample(min(args.n, len(bank)))
+    indexed_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    full = load_bank(args.bank)
+    full_seconds = time.perf_counter() - start
+    
+    for q in questions:
+        print(f"  - {q.get('question', '')[:70]}")
+    print(f"\nSampled {len(questions)} of {len(full)} questions in {indexed_seconds * 1000:.2f} ms "
+          f"via the index ({full_seconds * 1000:.2f} ms for a full parse)")
+
+if __name__ == "__main__":
+    if sys.platform == 'win32':
+        sys.stdout.reconfigure(encoding='utf-8')
+    main()
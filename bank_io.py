@@ -0,0 +1,235 @@
+"""
+Question bank I/O shared by the extraction, cleaning and bank scripts
+Banks are parsed with orjson when it is installed, written atomically,
+and pretty-printed like json.dump(indent=2) unless compact output is
+asked for. JSON Lines (.jsonl) files hold one question per line so they
+can be written and read one record at a time with bounded memory; JSON
+array files can be streamed the same way with iter_json_array and
+write_json_array
+"""
+
+import hashlib
+import json
+import os
+import re
+from collections.abc import Mapping
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Characters read at a time when streaming a JSON array
+READ_CHUNK = 1 << 16
+NON_WHITESPACE = re.compile(r'[^ \t\n\r]')
+
+# Certification ids as used by app.js CERTIFICATIONS, mapped to their banks
+CERTIFICATION_BANKS = {
+    'aws-developer': 'questions_aws_developer.json',
+    'aws-ai': 'questions_aws_ai.json',
+    'azure-developer': 'questions_azure_developer.json',
+    'azure-ai': 'questions_azure_ai.json',
+}
+
+def loads(data):
+    """Parse JSON text or bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def dumps(data, compact=False):
+    """Serialize to a str matching json.dumps(indent=2, ensure_ascii=False), or compact"""
+    if orjson is not None:
+        return orjson.dumps(data, option=0 if compact else orjson.OPT_INDENT_2).decode('utf-8')
+    if compact:
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+def question_hash(q):
+    """Stable content hash of a question, independent of key order"""
+    if orjson is not None:
+        # Same bytes as the json fallback below, several times faster
+        canonical = orjson.dumps(q, option=orjson.OPT_SORT_KEYS)
+    else:
+        canonical = json.dumps(q, sort_keys=True, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return hashlib.sha256(canonical).hexdigest()
+
+def atomic_write_bytes(path, data):
+    """Write data to path via a temporary file so readers never see a partial file"""
+    path = Path(path)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def atomic_write_text(path, text):
+    atomic_write_bytes(path, text.encode('utf-8'))
+
+def load_bank(path, missing_ok=False):
+    """Load a question bank (JSON array, .jsonl or .qpack); [] if missing and missing_ok"""
+    if missing_ok and not Path(path).exists():
+        return []
+    if is_jsonl(path):
+        return list(iter_jsonl(path))
+    if Path(path).suffix == '.qpack':
+        # Imported here: packed_bank builds on this module
+        from packed_bank import load_packed
+        return list(load_packed(path))
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
+def save_bank(questions, path, compact=False):
+    """Atomically save a question bank; .jsonl paths get one question per line, .qpack paths are packed"""
+    if is_jsonl(path):
+        write_jsonl(questions, path)
+    elif Path(path).suffix == '.qpack':
+        from packed_bank import save_packed
+        save_packed(questions, path)
+    else:
+        atomic_write_text(path, dumps(questions, compact=compact))
+
+def load_certification(cert_id):
+    return load_bank(CERTIFICATION_BANKS[cert_id])
+
+class LazyBanks(Mapping):
+    """Certification id -> question list, each bank parsed on first access only"""
+    
+    def __init__(self, banks=None):
+        self.files = dict(CERTIFICATION_BANKS if banks is None else banks)
+        self.loaded = {}
+    
+    def __getitem__(self, cert_id):
+        if cert_id not in self.loaded:
+            self.loaded[cert_id] = load_bank(self.files[cert_id])
+        return self.loaded[cert_id]
+    
+    def __iter__(self):
+        return iter(self.files)
+    
+    def __len__(self):
+        return len(self.files)
+
+def is_jsonl(path):
+    return Path(path).suffix == '.jsonl'
+
+def iter_jsonl(path):
+    """Yield questions from a JSON Lines file one at a time"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield loads(line)
+
+def write_jsonl(questions, path):
+    """Write questions to a JSON Lines file as they are produced; returns the count.
+    
+    Output goes to a temporary file that replaces path only once the
+    stream is exhausted, so a failed run never leaves a truncated file.
+    """
+    path = Path(path)
+    tmp_path = path.with_name(path.name + '.tmp')
+    count = 0
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        for q in questions:
+            f.write(dumps(q, compact=True) + '\n')
+            count += 1
+    os.replace(tmp_path, path)
+    return count
+
+def iter_json_array(path, chunk_size=READ_CHUNK):
+    """Yield the elements of a JSON array file one at a time.
+    
+    The file is read in chunks and each element is decoded as soon as it is
+    complete, so memory stays at one element plus the read buffer.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer = ''
+        pos = 0
+        
+        def more():
+            """Drop the consumed part of the buffer and read another chunk; False at end of file"""
+            nonlocal buffer, pos
+            chunk = f.read(chunk_size)
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            return bool(chunk)
+        
+        def next_char():
+            """Skip whitespace; the next character, or '' at end of file"""
+            nonlocal pos
+            while True:
+                match = NON_WHITESPACE.search(buffer, pos)
+                if match:
+                    pos = match.start()
+                    return buffer[pos]
+                pos = len(buffer)
+                if not more():
+                    return ''
+        
+        if next_char() != '[':
+            raise ValueError(f"{path} is not a JSON array")
+        pos += 1
+        if next_char() == ']':
+            return
+        while True:
+            next_char()
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    # Most likely the element continues in the next chunk
+                    if more():
+                        continue
+                    raise
+                # A number cut off at the end of the buffer may have more digits
+                if (not isinstance(value, (dict, list)) and buffer[end:end + 1] not in (' ', '\t', '\n', '\r', ',', ']')
+                        and more()):
+                    continue
+                break
+            pos = end
+            yield value
+            
+            char = next_char()
+            if char == ']':
+                return
+            if char != ',':
+                raise ValueError(f"{path}: expected ',' or ']' after array element, found {char!r}")
+            pos += 1
+
+def write_json_array(questions, path):
+    """Write questions as a JSON array as they are produced; returns the count.
+    
+    The output is byte-identical to save_bank's, and like write_jsonl it
+    only replaces path once the stream is exhausted.
+    """
+    path = Path(path)
+    tmp_path = path.with_name(path.name + '.tmp')
+    count = 0
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        for q in questions:
+            f.write(',\n  ' if count else '[\n  ')
+            f.write(dumps(q).replace('\n', '\n  '))
+            count += 1
+        f.write('\n]' if count else '[]')
+    os.replace(tmp_path, path)
+    return count
+
+def iter_questions(path):
+    """Yield questions one at a time; .jsonl and JSON array files are streamed"""
+    if is_jsonl(path):
+        yield from iter_jsonl(path)
+    elif Path(path).suffix == '.qpack':
+        yield from load_bank(path)
+    else:
+        yield from iter_json_array(path)
+
+def write_questions(questions, path):
+    """Save questions as they are produced; .jsonl and JSON array output is streamed"""
+    if is_jsonl(path):
+        return write_jsonl(questions, path)
+    if Path(path).suffix == '.qpack':
+        questions = list(questions)
+        save_bank(questions, path)
+        return len(questions)
+    return write_json_array(questions, path)
@@ -0,0 +1,203 @@
+"""
+Benchmark the single-pass block tokenizer against the previous regex option parser
+Runs both over every question block in the exam dumps and compares speed and yield
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+from extract_full import clean_spam_text, iter_page_blocks, parse_question_block
+from pdf_backends import BACKENDS, open_pdf_text
+
+def parse_question_block_regex(block):
+    """Previous parser: option regex, line-loop fallback and per-option cleanup"""
+    # Clean spam
+    block_clean = clean_spam_text(block)
+    
+    # Find Answer: line
+    answer_match = re.search(r'\n\s*Answer:\s*([A-E])(?:\s|$)', block_clean, re.IGNORECASE)
+    if not answer_match:
+        return None
+    
+    correct_letter = answer_match.group(1).upper()
+    answer_pos = answer_match.start()
+    
+    # Split into question+options and explanation
+    question_section = block_clean[:answer_pos].strip()
+    explanation_section = block_clean[answer_pos:].strip()
+    
+    # Extract explanation
+    explanation_match = re.search(r'Explanation:\s*(.+?)(?=References:|NEW QUESTION|$)', 
+                                  explanation_section, re.IGNORECASE | re.DOTALL)
+    explanation = ""
+    if explanation_match:
+        explanation = explanation_match.group(1).strip()
+        explanation = clean_spam_text(explanation)
+        explanation = re.sub(r'\s+', ' ', explanation)[:1500]
+    
+    # Extract options - look for patterns like "A. text" or "A text" before "B."
+    # More flexible pattern to handle various formats
+    option_pattern = r'([A-E])[\.\)]\s*([^\n]+(?:\n(?![A-E][\.\)])[^\n]+)*)'
+    option_matches = list(re.finditer(option_pattern, question_section))
+    
+    if not option_matches or len(option_matches) < 2:
+        # Try alternative pattern - options may be on new lines
+        lines = question_section.split('\n')
+        options_dict = {}
+        for line in lines:
+            opt_match = re.match(r'^\s*([A-E])[\.\)]\s*(.+)$', line.strip())
+            if opt_match:
+                letter = opt_match.group(1).upper()
+                text = opt_match.group(2).strip()
+                if text and len(text) > 2:
+                    options_dict[letter] = text
+        
+        if len(options_dict) >= 2:
+            # Find question text (before first option)
+            question_text = question_section
+            for letter in sorted(options_dict.keys()):
+                pos = question_section.find(f'{letter}.')
+                if pos == -1:
+                    pos = question_section.find(f'{letter})')
+                if pos != -1:
+                    question_text = question_section[:pos]
+                    break
+            
+            question_text = clean_spam_text(question_text.strip())
+            question_text = re.sub(r'\s+', ' ', question_text)
+            question_text = re.sub(r'^NEW QUESTION \d+\s*', '', question_text, flags=re.IGNORECASE)
+            
+            if len(question_text) < 20:
+                return None
+            
+            # Build options list
+            options = [options_dict.get(l, '') for l in sorted(options_dict.keys())]
+            options = [clean_spam_text(opt) for opt in options if opt]
+            options = [re.sub(r'\s+', ' ', opt) for opt in options]
+            
+            # Get correct answer text
+            correct_idx = ord(correct_letter) - ord('A')
+            if correct_idx < len(options):
+                correct_answer = options[correct_idx]
+            else:
+                correct_answer = options[0]  # Fallback
+            
+            question_obj = {
+                "question": question_text[:1200],
+                "options": options[:5],  # Max 5 options (A-E)
+                "answer": correct_answer,
+                "explanation": explanation if explanation else "No explanation provided."
+            }
+            
+            return question_obj
+    
+    # Original method with regex matches
+    if option_matches and len(option_matches) >= 2:
+        # Find question text (before first option)
+        first_option_pos = option_matches[0].start()
+        question_text = question_section[:first_option_pos].strip()
+        question_text = clean_spam_text(question_text)
+        question_text = re.sub(r'\s+', ' ', question_text)
+        question_text = re.sub(r'^NEW QUESTION \d+\s*', '', question_text, flags=re.IGNORECASE)
+        
+        if len(question_text) < 20:
+            return None
+        
+        # Build options list
+        options = []
+        for match in option_matches[:5]:  # Max 5 options (A-E)
+            option_text = match.group(2).strip()
+            option_text = clean_spam_text(option_text)
+            option_text = re.sub(r'\s+', ' ', option_text)
+            if option_text and len(option_text) > 2:
+                options.append(option_text)
+        
+        if len(options) < 2:
+            return None
+        
+        # Get correct answer text
+        correct_idx = ord(correct_letter) - ord('A')
+        if correct_idx < len(options):
+            correct_answer = options[correct_idx]
+        else:
+            correct_answer = options[0]
+        
+        question_obj = {
+            "question": question_text[:1200],
+            "options": options,
+            "answer": correct_answer,
+            "explanation": explanation if explanation else "No explanation provided."
+        }
+        
+        return question_obj
+    
+    return None
+
+def collect_blocks(pdf_files, backend):
+    """All question blocks of the given PDFs, in document order"""
+    blocks = []
+    for pdf_file in pdf_files:
+        with open_pdf_text(pdf_file, backend) as page_texts:
+            carry = ""
+            for _, page_blocks, carry in iter_page_blocks(page_texts()):
+                blocks.extend(page_blocks)
+            if carry:
+                blocks.append(carry)
+    return [block for block in blocks if len(block.strip()) >= 50]
+
+def run_parser(parse, blocks):
+    parsed = []
+    for block in blocks:
+        try:
+            parsed.append(parse(block))
+        except Exception:
+            parsed.append(None)
+    return parsed
+
+def time_parser(parse, blocks, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run_parser(parse, blocks)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("pdf_folder", nargs="?", default="exam_questions with answers")
+    parser.add_argument("--repeat", type=int, default=5, help="timing runs per parser, best is reported")
+    parser.add_argument("--backend", choices=["auto"] + list(BACKENDS), default="pdfplumber")
+    args = parser.parse_args()
+    
+    pdf_files = sorted(Path(args.pdf_folder).glob("*.pdf"))
+    print(f"Reading {len(pdf_files)} PDF files...")
+    blocks = collect_blocks(pdf_files, args.backend)
+    total_chars = sum(len(block) for block in blocks)
+    print(f"  {len(blocks)} question blocks, {total_chars} characters\n")
+    if not blocks:
+        return
+    
+    results = {}
+    for name, parse in [("regex", parse_question_block_regex), ("tokenizer", parse_question_block)]:
+        seconds = time_parser(parse, blocks, args.repeat)
+        parsed = run_parser(parse, blocks)
+        results[name] = parsed
+        yield_count = sum(1 for q in parsed if q)
+        print(f"{name:>10}: {seconds * 1000:8.1f} ms | {total_chars / seconds / 1e6:6.2f} MB/s | "
+              f"parsed {yield_count}/{len(blocks)}")
+    
+    regex, tokenizer = results["regex"], results["tokenizer"]
+    same = sum(1 for a, b in zip(regex, tokenizer) if a == b)
+    only_regex = sum(1 for a, b in zip(regex, tokenizer) if a and not b)
+    only_tokenizer = sum(1 for a, b in zip(regex, tokenizer) if b and not a)
+    print(f"\nIdentical results: {same}/{len(blocks)}")
+    print(f"Parsed only by regex: {only_regex} | only by tokenizer: {only_tokenizer}")
+
+if __name__ == "__main__":
+    if sys.platform == 'win32':
+        sys.stdout.reconfigure(encoding='utf-8')
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark every available PDF text backend over the same exam dumps
+Compares extraction throughput and how many questions each backend's text yields
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from extract_full import iter_page_blocks, parse_blocks
+from pdf_backends import AUTO_ORDER, backend_available, open_pdf_text
+
+def benchmark_backend(backend, pdf_files):
+    """Extract and parse pdf_files with one backend; returns timing and yield counters"""
+    result = {"seconds": 0.0, "pages": 0, "characters": 0, "blocks": 0, "questions": 0}
+    
+    for pdf_file in pdf_files:
+        pages = []
+        start = time.perf_counter()
+        with open_pdf_text(pdf_file, backend) as page_texts:
+            for page in page_texts():
+                pages.append(page)
+        result["seconds"] += time.perf_counter() - start
+        result["pages"] += len(pages)
+        result["characters"] += sum(len(text) for _, text in pages)
+        
+        blocks = []
+        carry = ""
+        for _, page_blocks, carry in iter_page_blocks(pages):
+            blocks.extend(page_blocks)
+        if carry:
+            blocks.append(carry)
+        result["blocks"] += len(blocks)
+        result["questions"] += len(parse_blocks(blocks, 1))
+    
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("pdf_folder", nargs="?", default="exam_questions with answers")
+    args = parser.parse_args()
+    
+    pdf_files = sorted(Path(args.pdf_folder).glob("*.pdf"))
+    print(f"Benchmarking {len(pdf_files)} PDF files\n")
+    if not pdf_files:
+        return
+    
+    for backend in AUTO_ORDER:
+        if backend == "sidecar":
+            usable = all(backend_available(backend, pdf_file) for pdf_file in pdf_files)
+        else:
+            usable = backend_available(backend)
+        if not usable:
+            print(f"{backend:>10}: not available")
+            continue
+        
+        r = benchmark_backend(backend, pdf_files)
+        seconds = r["seconds"] or 1e-9
+        print(f"{backend:>10}: {r['seconds']:7.2f} s | {r['pages'] / seconds:8.1f} pages/s | "
+              f"{r['characters'] / seconds / 1e6:6.2f} MB/s | "
+              f"{r['blocks']} blocks -> {r['questions']} questions")
+
+if __name__ == "__main__":
+    if sys.platform == 'win32':
+        sys.stdout.reconfigure(encoding='utf-8')
+    main()
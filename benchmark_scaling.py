@@ -0,0 +1,184 @@
+"""
+Scaling benchmark for the question pipeline on synthetic corpora
+Times and memory-profiles each pipeline step at several corpus sizes and
+flags steps whose time or peak memory grows faster than linearly.
+
+Usage:
+    python benchmark_scaling.py                                # 10k and 100k questions
+    python benchmark_scaling.py --sizes 10000 100000 1000000 --report scaling.json
+"""
+
+import argparse
+import math
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from add_multiple_answers import make_questions_realistic
+from answer_matching import TRIGRAM_CACHE
+from bank_io import atomic_write_text, dumps, load_bank
+from clean_questions import CACHES, RULE_SETS, clean_questions
+from extract_full import iter_page_blocks, parse_blocks, remove_duplicates
+from fix_azure_questions import check_and_fix_questions
+from pdf_backends import open_sidecar
+from synthetic_corpus import write_corpus
+from validate_banks import validate_bank
+from verify_options_count import scan_bank
+
+DEFAULT_SIZES = [10_000, 100_000]
+# Growth exponent (time ~ size^k) above which a step is flagged
+SUPERLINEAR_EXPONENT = 1.2
+# Timings this short are too noisy to judge scaling from
+MIN_SECONDS = 0.05
+
+def working_copy(path, work_dir):
+    """Copy of a corpus file for steps that rewrite their input in place"""
+    copy = Path(work_dir) / path.name
+    shutil.copyfile(path, copy)
+    return copy
+
+def extract_dump(dump_file):
+    blocks = []
+    carry = ""
+    with open_sidecar(dump_file.with_suffix('.pdf')) as page_texts:
+        for _, page_blocks, carry in iter_page_blocks(page_texts()):
+            blocks.extend(page_blocks)
+    if carry:
+        blocks.append(carry)
+    return parse_blocks(blocks, 1)
+
+# Each step prepares its input (untimed) and returns the call to measure
+def step_extract_parse(paths, work_dir):
+    return lambda: extract_dump(paths["dump"])
+
+def step_remove_duplicates(paths, work_dir):
+    questions = load_bank(paths["bank"])
+    return lambda: remove_duplicates(questions)
+
+def step_clean_questions(paths, work_dir):
+    # The cleaning caches and rule counters are module globals; without a reset
+    # the memory run and every later size would be measured warm
+    for cache in [*CACHES.values(), TRIGRAM_CACHE]:
+        cache.clear()
+    for rule_set in RULE_SETS:
+        rule_set.take_counters()
+    return lambda: clean_questions(paths["raw"], Path(work_dir) / "cleaned.json")
+
+def step_validate_bank(paths, work_dir):
+    bank = working_copy(paths["bank"], work_dir)
+    return lambda: validate_bank(bank, full=True)
+
+def step_verify_options_count(paths, work_dir):
+    bank = working_copy(paths["bank"], work_dir)
+    # full: a cold check of every question, as the validate_banks step measures it
+    return lambda: scan_bank(bank, full=True)
+
+def step_add_multiple_answers(paths, work_dir):
+    bank = working_copy(paths["bank"], work_dir)
+    return lambda: make_questions_realistic(bank, "Synthetic")
+
+def step_fix_azure_questions(paths, work_dir):
+    bank = working_copy(paths["bank"], work_dir)
+    # No neighbor table cache: it would land in the current directory and make later runs warm
+    return lambda: check_and_fix_questions(str(bank), cache_file=None)
+
+STEPS = {
+    "extract_full.parse": step_extract_parse,
+    "extract_full.remove_duplicates": step_remove_duplicates,
+    "clean_questions.clean_questions": step_clean_questions,
+    "validate_banks.validate_bank": step_validate_bank,
+    "verify_options_count.scan_bank": step_verify_options_count,
+    "add_multiple_answers.make_questions_realistic": step_add_multiple_answers,
+    "fix_azure_questions.check_and_fix_questions": step_fix_azure_questions,
+}
+
+def measure(step, paths, work_dir, memory=True):
+    """(seconds, peak traced bytes or None) for one step; output is discarded"""
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, redirect_stdout(devnull):
+        run = STEPS[step](paths, work_dir)
+        start = time.perf_counter()
+        run()
+        seconds = time.perf_counter() - start
+        
+        peak = None
+        if memory:
+            # A separate run: tracing slows Python code several times over
+            run = STEPS[step](paths, work_dir)
+            tracemalloc.start()
+            run()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    return seconds, peak
+
+def growth_exponent(size_a, value_a, size_b, value_b):
+    if not value_a or not value_b:
+        return None
+    return math.log(value_b / value_a) / math.log(size_b / size_a)
+
+def scaling_flags(results, sizes):
+    """{step: [messages]} for steps growing faster than linearly between consecutive sizes"""
+    flags = {}
+    for step, by_size in results.items():
+        for size_a, size_b in zip(sizes, sizes[1:]):
+            a, b = by_size[size_a], by_size[size_b]
+            if max(a["seconds"], b["seconds"]) >= MIN_SECONDS:
+                k = growth_exponent(size_a, a["seconds"], size_b, b["seconds"])
+                if k is not None and k > SUPERLINEAR_EXPONENT:
+                    flags.setdefault(step, []).append(f"time ~ n^{k:.2f} from {size_a:,} to {size_b:,}")
+            k = growth_exponent(size_a, a["peak_bytes"], size_b, b["peak_bytes"])
+            if k is not None and k > SUPERLINEAR_EXPONENT:
+                flags.setdefault(step, []).append(f"memory ~ n^{k:.2f} from {size_a:,} to {size_b:,}")
+    return flags
+
+def main():
+    parser = argparse.ArgumentParser(description="Time and memory-profile pipeline steps on synthetic corpora")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="corpus sizes in questions (default: 10000 100000)")
+    parser.add_argument("--steps", nargs="+", choices=list(STEPS), default=list(STEPS))
+    parser.add_argument("--corpus-dir", help="keep generated corpora here instead of a temporary directory")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc runs")
+    parser.add_argument("--report", help="write results and flags as JSON to this file")
+    args = parser.parse_args()
+    
+    sizes = sorted(args.sizes)
+    results = {step: {} for step in args.steps}
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus_dir = Path(args.corpus_dir or tmp)
+        for size in sizes:
+            print(f"\n{size:,} questions")
+            paths = write_corpus(size, corpus_dir)
+            for step in args.steps:
+                with tempfile.TemporaryDirectory() as work_dir:
+                    seconds, peak = measure(step, paths, work_dir, memory=not args.no_memory)
+                results[step][size] = {"seconds": seconds, "peak_bytes": peak}
+                memory = f"{peak / 1e6:9.1f} MB peak" if peak is not None else ""
+                print(f"  {step:<46} {seconds:9.3f} s {memory}")
+    
+    flags = scaling_flags(results, sizes)
+    print("\n" + "="*70)
+    if flags:
+        for step, messages in flags.items():
+            for message in messages:
+                print(f"⚠ {step}: super-linear, {message}")
+    else:
+        print("✓ No super-linear scaling detected")
+    print("="*70)
+    
+    if args.report:
+        report = {
+            "sizes": sizes,
+            "results": {step: {str(size): r for size, r in by_size.items()} for step, by_size in results.items()},
+            "flags": flags,
+        }
+        atomic_write_text(args.report, dumps(report) + '\n')
+        print(f"Report written to {args.report}")
+
+if __name__ == "__main__":
+    if sys.platform == 'win32':
+        sys.stdout.reconfigure(encoding='utf-8')
+    main()
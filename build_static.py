@@ -0,0 +1,124 @@
+"""
+Build the question banks for static hosting
+Each certification bank is minified, named by its content hash and written
+with precompressed .gz and .br variants. Every question gets answerIndices,
+the sorted indices of its correct options, and the build fails if any
+answer does not match an option. A manifest maps certification ids
+to the hashed URLs, so the hashed files can be cached forever and a client
+only re-downloads a bank whose content changed.
+
+Usage:
+    python build_static.py        # writes banks/ and banks-manifest.json
+"""
+
+import argparse
+import gzip
+import hashlib
+import os
+import re
+import sys
+from pathlib import Path
+
+from answer_keys import add_answer_indices
+from bank_io import CERTIFICATION_BANKS, atomic_write_bytes, atomic_write_text, dumps, load_bank
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+OUTPUT_DIR = "banks"
+MANIFEST_FILE = "banks-manifest.json"
+MANIFEST_VERSION = 1
+HASH_LENGTH = 16
+
+def build_bank(questions, bank_file, output_dir, base_dir):
+    """Write the minified, hashed bank and its compressed variants; returns its manifest entry.
+    
+    The entry's url is relative to base_dir, the directory the manifest is served from.
+    """
+    data = dumps(questions, compact=True).encode('utf-8')
+    digest = hashlib.sha256(data).hexdigest()
+    
+    path = output_dir / f"{Path(bank_file).stem}.{digest[:HASH_LENGTH]}.json"
+    atomic_write_bytes(path, data)
+    # mtime=0 keeps the .gz bytes identical between builds of the same bank
+    gzip_data = gzip.compress(data, compresslevel=9, mtime=0)
+    atomic_write_bytes(path.with_name(path.name + '.gz'), gzip_data)
+    brotli_data = None
+    if brotli is not None:
+        brotli_data = brotli.compress(data, quality=11)
+        atomic_write_bytes(path.with_name(path.name + '.br'), brotli_data)
+    
+    return {
+        "url": Path(os.path.relpath(path, base_dir)).as_posix(),
+        "sha256": digest,
+        "questions": len(questions),
+        "bytes": len(data),
+        "gzip_bytes": len(gzip_data),
+        "brotli_bytes": len(brotli_data) if brotli_data is not None else None,
+    }
+
+def build_static(output_dir=OUTPUT_DIR, manifest_file=MANIFEST_FILE, banks=CERTIFICATION_BANKS):
+    """Build every bank and the manifest, removing hashed files from earlier builds.
+    
+    Raises ValueError, before writing anything, if any question's answer can't be keyed.
+    """
+    keyed_banks = {}
+    problems = []
+    for cert_id, bank_file in banks.items():
+        questions = load_bank(bank_file)
+        for position, problem in add_answer_indices(questions):
+            problems.append(f"{bank_file} Q{position + 1}: {problem}")
+        keyed_banks[cert_id] = questions
+    if problems:
+        raise ValueError(f"{len(problems)} question(s) have no valid answer key:\n  " + "\n  ".join(problems))
+    
+    output_dir = Path(output_dir)
+    output_dir.mkdir(exist_ok=True)
+    
+    base_dir = Path(manifest_file).parent
+    
+    manifest = {"version": MANIFEST_VERSION, "banks": {}}
+    for cert_id, bank_file in banks.items():
+        manifest["banks"][cert_id] = build_bank(keyed_banks[cert_id], bank_file, output_dir, base_dir)
+    
+    # Only files named like a hashed bank from an earlier build are removed
+    stems = '|'.join(re.escape(Path(bank_file).stem) for bank_file in banks.values())
+    hashed_name = re.compile(rf'(?:{stems})\.[0-9a-f]{{{HASH_LENGTH}}}\.json(?:\.gz|\.br)?')
+    current = set()
+    for entry in manifest["banks"].values():
+        name = Path(entry["url"]).name
+        current.update({name, name + '.gz', name + '.br'})
+    for path in output_dir.iterdir():
+        if hashed_name.fullmatch(path.name) and path.name not in current:
+            path.unlink()
+    
+    atomic_write_text(manifest_file, dumps(manifest) + '\n')
+    return manifest
+
+def main():
+    parser = argparse.ArgumentParser(description="Build minified, content-hashed, precompressed question banks")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR, help=f"directory for hashed banks (default: {OUTPUT_DIR})")
+    parser.add_argument("--manifest", default=MANIFEST_FILE, help=f"manifest path (default: {MANIFEST_FILE})")
+    args = parser.parse_args()
+    
+    if brotli is None:
+        print("brotli not installed - skipping .br variants (pip install brotli)")
+    
+    try:
+        manifest = build_static(args.output_dir, args.manifest)
+    except ValueError as e:
+        print(f"✗ Build failed: {e}")
+        sys.exit(1)
+    for cert_id, entry in manifest["banks"].items():
+        sizes = f"{entry['bytes']:,} B, {entry['gzip_bytes']:,} B gzip"
+        if entry["brotli_bytes"] is not None:
+            sizes += f", {entry['brotli_bytes']:,} B brotli"
+        print(f"  {cert_id:<16} -> {entry['url']} ({sizes})")
+    print(f"\n✓ Wrote {args.manifest}")
+
+if __name__ == "__main__":
+    if sys.platform == 'win32':
+        sys.stdout.reconfigure(encoding='utf-8')
+    main()
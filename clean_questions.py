@@ -1,34 +1,52 @@
-import json
+import argparse
+import hashlib
 import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from answer_matching import DEFAULT_THRESHOLD, AnswerMatcher
+from bank_io import atomic_write_text, dumps, iter_questions, write_questions
+from cleanup_rules import RULES_FILE, load_rule_set, print_rule_stats
+from memo_cache import DEFAULT_MAXSIZE, MemoCache, load_caches, save_caches
+
+# Spam/watermark patterns and truncation fixes, see cleanup_rules.json
+CLEAN_SPAM = load_rule_set("spam", "clean")
+TRUNCATIONS = load_rule_set("truncations", "clean")
+RULE_SETS = (CLEAN_SPAM, TRUNCATIONS)
+
+# Questions per task in --workers mode
+DEFAULT_CHUNK_SIZE = 500
+
+# Cleaning results and their rule hits by raw string; options and stems repeat a lot
+TEXT_CACHE = MemoCache()
+OPTION_CACHE = MemoCache()
+CACHES = {"text": TEXT_CACHE, "options": OPTION_CACHE}
+# Bump when clean_text or clean_option change so persisted cache entries are discarded
+CLEANING_VERSION = 2
+
+def cache_version():
+    """Persisted results are only valid for the same cleaning code and cleanup rules"""
+    return f"{CLEANING_VERSION}:{hashlib.sha256(RULES_FILE.read_bytes()).hexdigest()[:16]}"
+
+def count_cached_hits(value):
+    """Count the rule hits of a cached (result, hits) again, as if it had been cleaned"""
+    hits = value[1]
+    for rule_set in RULE_SETS:
+        rule_set.add_counters(({name: n for name, n in hits.items() if name in rule_set.hits}, 1, 0.0))
 
 def clean_text(text):
-    """Clean and fix question text"""
-    # Remove spam/watermark text
-    spam_patterns = [
-        r'Passing Certification Exams Made Easy.*?\.com',
-        r'Recommend!!.*?Questions?\)',
-        r'visit\s*-\s*https?://.*?\.com',
-        r'Get the Full DVA-C02 dumps.*?Questions?\)',
-        r'Your Partner of IT Exam.*?Questions?\)',
-        r'\(127 New Questions?\)',
-        r'https?://www\..*?\.com[^\s]*',
-    ]
-    
-    for pattern in spam_patterns:
-        text = re.sub(pattern, '', text, flags=re.IGNORECASE | re.DOTALL)
-    
-    # Fix common truncations
-    text = text.replace('functio ', 'function ')
-    text = text.replace('bucke ', 'bucket ')
-    text = text.replace('clas ', 'class ')
-    text = text.replace(' F. ', '. ')
-    text = text.replace(' G. ', '. ')
-    text = text.replace(' H. ', '. ')
-    text = text.replace(' I. ', '. ')
-    text = text.replace(' J. ', '. ')
-    text = text.replace(' K. ', '. ')
-    text = text.replace(' L. ', '. ')
-    text = text.replace(' M. ', '. ')
+    """Clean and fix question text, memoized in TEXT_CACHE"""
+    return TEXT_CACHE.lookup(text, clean_text_counted, count_cached_hits)[0]
+
+def clean_text_counted(text):
+    hits = {}
+    return clean_text_uncached(text, hits), hits
+
+def clean_text_uncached(text, hits=None):
+    """Clean and fix question text; rule matches are also counted into hits if given"""
+    text = CLEAN_SPAM.apply(text, hits)
+    text = TRUNCATIONS.apply(text, hits)
     
     # Remove multiple spaces
     text = re.sub(r'\s+', ' ', text)
@@ -45,14 +63,33 @@ def is_valid_option(option):
         return False
     return True
 
-def clean_questions(input_file, output_file):
-    """Clean all questions"""
-    with open(input_file, 'r', encoding='utf-8') as f:
-        questions = json.load(f)
-    
-    cleaned = []
+def clean_option(option):
+    """The cleaned option, or None if it isn't worth keeping; memoized in OPTION_CACHE"""
+    return OPTION_CACHE.lookup(option, clean_option_counted, count_cached_hits)[0]
+
+def clean_option_counted(option):
+    hits = {}
+    clean_opt = clean_text_uncached(option, hits)
+    if is_valid_option(clean_opt) and len(clean_opt) < 500:
+        return clean_opt, hits
+    return None, hits
+
+def new_counts():
+    return {"original": 0, "cleaned": 0, "fuzzy_matched": 0, "unresolved": 0}
+
+def iter_cleaned_questions(questions, counts, matcher=None, unresolved=None, start=1):
+    """Clean questions one at a time, yielding those worth keeping.
     
-    for q in questions:
+    An answer that isn't exactly one of the cleaned options is mapped to
+    its closest option by matcher; if none is close enough the question is
+    dropped and recorded in unresolved, keyed by its 1-based input position
+    counted from start.
+    """
+    if matcher is None:
+        matcher = AnswerMatcher()
+    for position, q in enumerate(questions, start):
+        counts["original"] += 1
+        
         # Clean question text
         question_text = clean_text(q['question'])
         
@@ -63,41 +100,175 @@ def clean_questions(input_file, output_file):
         # Clean options
         clean_options = []
         for opt in q['options']:
-            clean_opt = clean_text(opt)
-            if is_valid_option(clean_opt) and len(clean_opt) < 500:
+            clean_opt = clean_option(opt)
+            if clean_opt is not None:
                 clean_options.append(clean_opt)
         
         # Need at least 3 good options
         if len(clean_options) < 3:
             continue
         
-        # Clean answer and explanation
+        # Clean answer and explanation; explanations are long and mostly unique, so they would only crowd the cache
         answer = clean_text(q['answer'])
-        explanation = clean_text(q.get('explanation', ''))
+        explanation = clean_text_uncached(q.get('explanation', ''))
         
         # Make sure answer is in options
         if answer not in clean_options:
-            # Try to find best match
-            answer = clean_options[0]
+            index, confidence, reason = matcher.match(answer, clean_options)
+            if index is None:
+                counts["unresolved"] += 1
+                if unresolved is not None:
+                    unresolved.append({"question": position, "text": question_text[:120], "answer": answer,
+                                       "confidence": round(confidence, 3), "reason": reason})
+                continue
+            answer = clean_options[index]
+            counts["fuzzy_matched"] += 1
         
-        cleaned.append({
+        counts["cleaned"] += 1
+        yield {
             "question": question_text,
             "options": clean_options,
             "answer": answer,
             "explanation": explanation[:1000] if explanation else "Refer to AWS documentation for details."
-        })
+        }
+
+def set_cache_size(cache_size):
+    for cache in CACHES.values():
+        cache.maxsize = cache_size
+
+def init_worker(cache_file, cache_size):
+    """Start a worker with the persisted cache and, under fork, without the parent's counters"""
+    set_cache_size(cache_size)
+    for rule_set in RULE_SETS:
+        rule_set.take_counters()
+    for cache in CACHES.values():
+        cache.take_new()
+        cache.track_new = True
+    if cache_file:
+        load_caches(cache_file, cache_version(), CACHES)
+
+def clean_chunk(questions, start, matcher):
+    """Clean one chunk in a worker process.
+    
+    Returns (kept questions, counts, unresolved answers, rule counters, new cache entries).
+    """
+    counts = new_counts()
+    unresolved = []
+    cleaned = list(iter_cleaned_questions(questions, counts, matcher, unresolved, start))
+    return (cleaned, counts, unresolved, [rule_set.take_counters() for rule_set in RULE_SETS],
+            {name: cache.take_new() for name, cache in CACHES.items()})
+
+def iter_chunks(questions, chunk_size):
+    questions = iter(questions)
+    while chunk := list(islice(questions, chunk_size)):
+        yield chunk
+
+def iter_cleaned_parallel(questions, counts, workers, chunk_size=DEFAULT_CHUNK_SIZE, matcher=None,
+                          unresolved=None, cache_file=None, cache_size=DEFAULT_MAXSIZE):
+    """iter_cleaned_questions spread over a process pool, yielding in input order.
     
-    print(f"Original: {len(questions)} questions")
-    print(f"Cleaned: {len(cleaned)} questions")
-    print(f"Removed: {len(questions) - len(cleaned)} questions")
+    Only a few chunks per worker are in flight at once, so streamed .jsonl
+    input is never read into memory whole. Each worker keeps its own cache;
+    the entries they compute are merged back into this process's caches.
+    """
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(cache_file, cache_size)) as pool:
+        pending = deque()
+        
+        def collect():
+            cleaned, chunk_counts, chunk_unresolved, counters, new_entries = pending.popleft().result()
+            for key, n in chunk_counts.items():
+                counts[key] += n
+            if unresolved is not None:
+                unresolved.extend(chunk_unresolved)
+            for rule_set, rule_counters in zip(RULE_SETS, counters):
+                rule_set.add_counters(rule_counters)
+            for name, taken in new_entries.items():
+                CACHES[name].add_new(taken)
+            return cleaned
+        
+        start = 1
+        for chunk in iter_chunks(questions, chunk_size):
+            pending.append(pool.submit(clean_chunk, chunk, start, matcher or AnswerMatcher()))
+            start += len(chunk)
+            if len(pending) > 2 * workers:
+                yield from collect()
+        while pending:
+            yield from collect()
+
+def clean_questions(input_file, output_file, workers=1, chunk_size=DEFAULT_CHUNK_SIZE,
+                    cache_file=None, cache_size=DEFAULT_MAXSIZE, match_threshold=DEFAULT_THRESHOLD,
+                    unresolved_report=None):
+    """Clean all questions, streaming them one at a time from input_file to output_file.
     
-    # Save cleaned questions
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(cleaned, f, indent=2, ensure_ascii=False)
+    With workers > 1, chunks of chunk_size questions are cleaned in a
+    process pool; the output is identical to a serial run. Cleaning results
+    are memoized in bounded LRU caches of cache_size strings each, loaded
+    from and saved back to cache_file if given.
     
-    return len(cleaned)
+    Answers are fuzzy-matched to their options at match_threshold; questions
+    whose answer can't be resolved are dropped and listed in unresolved_report.
+    """
+    counts = new_counts()
+    matcher = AnswerMatcher(match_threshold)
+    unresolved = []
+    set_cache_size(cache_size)
+    if cache_file:
+        loaded = load_caches(cache_file, cache_version(), CACHES)
+        print(f"Loaded {loaded} cached cleaning results from {cache_file}")
+    
+    questions = iter_questions(input_file)
+    if workers > 1:
+        cleaned = iter_cleaned_parallel(questions, counts, workers, chunk_size, matcher, unresolved,
+                                        cache_file, cache_size)
+    else:
+        cleaned = iter_cleaned_questions(questions, counts, matcher, unresolved)
+    
+    # Save cleaned questions as they are produced
+    write_questions(cleaned, output_file)
+    
+    print(f"Original: {counts['original']} questions")
+    print(f"Cleaned: {counts['cleaned']} questions")
+    print(f"Removed: {counts['original'] - counts['cleaned']} questions")
+    print(f"Fuzzy-matched answers: {counts['fuzzy_matched']}")
+    print(f"Unresolved answers (dropped): {counts['unresolved']}")
+    for item in unresolved[:5]:
+        print(f"  Q{item['question']}: {item['reason']} ({item['confidence']:.2f}) {item['answer'][:60]!r}")
+    if unresolved_report:
+        atomic_write_text(unresolved_report, dumps(unresolved) + '\n')
+        print(f"Unresolved answers written to {unresolved_report}")
+    for name, cache in CACHES.items():
+        print(f"Cache ({name}): {cache.hit_rate():.1%} hit rate, {cache.hits} hits, {cache.misses} misses")
+    
+    if cache_file:
+        save_caches(cache_file, cache_version(), CACHES)
+    
+    return counts["cleaned"]
 
 if __name__ == "__main__":
-    count = clean_questions('questions_full.json', 'questions_cleaned.json')
-    print(f"\n✅ Created {count} clean questions in questions_cleaned.json")
-
+    parser = argparse.ArgumentParser(description="Clean extracted questions")
+    parser.add_argument("input_file", nargs="?", default="questions_full.json",
+                        help="questions to clean, .json or .jsonl (default: questions_full.json)")
+    parser.add_argument("output_file", nargs="?", default="questions_cleaned.json",
+                        help="where to write, .json or .jsonl (default: questions_cleaned.json)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes to clean chunks of questions in parallel (default: 1)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"questions per chunk with --workers (default: {DEFAULT_CHUNK_SIZE})")
+    parser.add_argument("--cache-file",
+                        help="load memoized cleaning results from this file and save them back after the run")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_MAXSIZE,
+                        help=f"strings kept in each cleaning cache (default: {DEFAULT_MAXSIZE})")
+    parser.add_argument("--match-threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"confidence needed to map an answer to a fuzzy-matched option (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--unresolved-report",
+                        help="write the questions whose answer matched no option to this JSON file")
+    parser.add_argument("--rule-stats", action="store_true",
+                        help="print how often each cleanup rule matched and the time spent applying them")
+    args = parser.parse_args()
+    
+    count = clean_questions(args.input_file, args.output_file, args.workers, args.chunk_size,
+                            args.cache_file, args.cache_size, args.match_threshold, args.unresolved_report)
+    print(f"\n✅ Created {count} clean questions in {args.output_file}")
+    if args.rule_stats:
+        print_rule_stats(RULE_SETS)
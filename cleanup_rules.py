@@ -0,0 +1,168 @@
+"""
+Spam and cleanup rules shared by extract_full and clean_questions
+Rules live in cleanup_rules.json, each tagged with the stages that use it.
+A stage's rules are compiled into one alternation and applied in a single
+left-to-right pass; each rule counts its hits so stale watermark patterns
+show up in the stats.
+
+Usage:
+    python cleanup_rules.py [bank.json ...]   # per-rule hits and cost over a corpus
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+from bank_io import load_bank, loads
+
+RULES_FILE = Path(__file__).with_name('cleanup_rules.json')
+
+def load_rules(path=RULES_FILE):
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
+def rule_pattern(rule):
+    return re.escape(rule['literal']) if 'literal' in rule else rule['pattern']
+
+class RuleSet:
+    """A group of rules applied to text, counting hits per rule.
+    
+    By default the rules are compiled into one alternation and applied in a
+    single pass: where several could match at the same position the one
+    listed first wins, and matches never overlap. A sequential set applies
+    its rules one after another instead, each seeing the previous one's
+    output, with plain str.replace for literal rules.
+    """
+    
+    def __init__(self, name, rules, flags=0, sequential=False):
+        self.name = name
+        self.rules = rules
+        self.flags = flags
+        self.sequential = sequential
+        self.replacements = {rule['name']: rule.get('replace', '') for rule in rules}
+        if sequential:
+            self.steps = [(rule['name'], rule.get('literal'), None if 'literal' in rule else re.compile(rule['pattern'], flags),
+                           rule.get('replace', '')) for rule in rules]
+        else:
+            self.pattern = re.compile('|'.join(f"(?P<{rule['name']}>{rule_pattern(rule)})" for rule in rules), flags)
+        self.hits = {rule['name']: 0 for rule in rules}
+        self.calls = 0
+        self.seconds = 0.0
+    
+    def _apply_sequential(self, text, hits):
+        for name, literal, pattern, replace in self.steps:
+            if literal is not None:
+                if literal not in text:
+                    continue
+                n = text.count(literal)
+                text = text.replace(literal, replace)
+            else:
+                text, n = pattern.subn(replace, text)
+                if not n:
+                    continue
+            self.hits[name] += n
+            if hits is not None:
+                hits[name] = hits.get(name, 0) + n
+        return text
+    
+    def _apply_combined(self, text, hits):
+        matched = []
+        
+        def replace(match):
+            matched.append(match.lastgroup)
+            return self.replacements[match.lastgroup]
+        
+        text = self.pattern.sub(replace, text)
+        for name in matched:
+            self.hits[name] += 1
+            if hits is not None:
+                hits[name] = hits.get(name, 0) + 1
+        return text
+    
+    def apply(self, text, hits=None):
+        """Apply the rules to text; matches are also counted into hits if given"""
+        start = time.perf_counter()
+        if self.sequential:
+            text = self._apply_sequential(text, hits)
+        else:
+            text = self._apply_combined(text, hits)
+        self.calls += 1
+        self.seconds += time.perf_counter() - start
+        return text
+    
+    def take_counters(self):
+        """(hits, calls, seconds) since the last call, resetting them; for shipping counts out of a worker"""
+        counters = (self.hits, self.calls, self.seconds)
+        self.hits = dict.fromkeys(self.hits, 0)
+        self.calls = 0
+        self.seconds = 0.0
+        return counters
+    
+    def add_counters(self, counters):
+        hits, calls, seconds = counters
+        for name, n in hits.items():
+            self.hits[name] += n
+        self.calls += calls
+        self.seconds += seconds
+    
+    def profile(self, texts):
+        """Seconds each rule would take on its own over texts, to find expensive patterns"""
+        seconds = {}
+        for rule in self.rules:
+            pattern = re.compile(rule_pattern(rule), self.flags)
+            start = time.perf_counter()
+            for text in texts:
+                pattern.sub('', text)
+            seconds[rule['name']] = time.perf_counter() - start
+        return seconds
+
+def load_rule_set(section, stage, path=RULES_FILE):
+    """The RuleSet of one config section ("spam", "truncations") for one stage"""
+    config = load_rules(path)[section]
+    flags = 0
+    for flag in config.get('flags', []):
+        flags |= getattr(re, flag)
+    rules = [rule for rule in config['rules'] if stage in rule['stages']]
+    return RuleSet(f"{section}:{stage}", rules, flags, config.get('sequential', False))
+
+def print_rule_stats(rule_sets):
+    """Per-rule hit counts and total pass time for each rule set"""
+    for rule_set in rule_sets:
+        print(f"\n{rule_set.name}: {rule_set.calls} texts, {rule_set.seconds:.3f} s")
+        for name, hits in sorted(rule_set.hits.items(), key=lambda item: -item[1]):
+            print(f"  {name:<24} {hits:>8} hits")
+
+def bank_texts(questions):
+    for q in questions:
+        yield q.get('question', '')
+        yield from q.get('options', [])
+        answer = q.get('answer', '')
+        yield from answer if isinstance(answer, list) else [answer]
+        yield q.get('explanation', '')
+
+def main():
+    parser = argparse.ArgumentParser(description="Report cleanup rule hits and cost over question banks")
+    parser.add_argument("banks", nargs="*", default=["questions_full_backup.json"])
+    parser.add_argument("--stage", choices=["extract", "clean"], default="clean")
+    args = parser.parse_args()
+    
+    texts = [text for bank_file in args.banks for text in bank_texts(load_bank(bank_file))]
+    print(f"{len(texts)} texts from {len(args.banks)} bank(s), {args.stage} stage")
+    
+    for section in ("spam", "truncations"):
+        rule_set = load_rule_set(section, args.stage)
+        if not rule_set.rules:
+            continue
+        for text in texts:
+            rule_set.apply(text)
+        print_rule_stats([rule_set])
+        print("  Cost of each rule as a separate pass:")
+        for name, seconds in rule_set.profile(texts).items():
+            print(f"  {name:<24} {seconds * 1000:8.2f} ms")
+
+if __name__ == "__main__":
+    if sys.platform == 'win32':
+        sys.stdout.reconfigure(encoding='utf-8')
+    main()
@@ -3,24 +3,17 @@ Comprehensive Question Generator - 300+ Questions per Certification
 Professional quality questions for 1M+ users
 """
 
-import json
 import sys
-from pathlib import Path
+
+from bank_io import load_bank, save_bank
 
 # Fix Windows console encoding
 if sys.platform == 'win32':
     import io
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
-def load_existing(filepath):
-    if Path(filepath).exists():
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    return []
-
 def save_questions(questions, filepath):
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(questions, f, indent=2, ensure_ascii=False)
+    save_bank(questions, filepath)
     print(f"SAVED: {len(questions)} questions -> {filepath}")
 
 def create_question(q, opts, ans, exp):
@@ -30,7 +23,7 @@ def create_question(q, opts, ans, exp):
 def generate_aws_developer_300():
     """Generate comprehensive AWS Developer question bank"""
     
-    existing = load_existing('questions_aws_developer.json')
+    existing = load_bank('questions_aws_developer.json', missing_ok=True)
     all_q = existing.copy()
     
     # LAMBDA questions (40 questions)
@@ -385,7 +378,7 @@ def generate_aws_developer_300():
 
 def generate_aws_ai_300():
     """Generate 300+ AWS AI questions"""
-    existing = load_existing('questions_aws_ai.json')
+    existing = load_bank('questions_aws_ai.json', missing_ok=True)
     all_q = existing.copy()
     
     new_ai_questions = [
@@ -448,7 +441,7 @@ def generate_aws_ai_300():
 
 def generate_azure_developer_300():
     """Generate 300+ Azure Developer questions"""
-    existing = load_existing('questions_azure_developer.json')
+    existing = load_bank('questions_azure_developer.json', missing_ok=True)
     all_q = existing.copy()
     
     new_azure_dev = [
@@ -480,7 +473,7 @@ def generate_azure_developer_300():
 
 def generate_azure_ai_300():
     """Generate 300+ Azure AI questions"""
-    existing = load_existing('questions_azure_ai.json')
+    existing = load_bank('questions_azure_ai.json', missing_ok=True)
     all_q = existing.copy()
     
     new_azure_ai = [
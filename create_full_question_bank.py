@@ -3,21 +3,14 @@ Create comprehensive question banks for AWS certifications
 Target: 450+ questions per certification for 1M+ users
 """
 
-import json
 import random
 
-def load_existing_questions(filename):
-    """Load existing questions"""
-    try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except:
-        return []
+from bank_io import load_bank
 
 def create_developer_questions():
     """Create comprehensive DVA-C02 question bank - 450 questions"""
     
-    existing = load_existing_questions('questions_full.json')
+    existing = load_bank('questions_full.json', missing_ok=True)
     questions = existing.copy()
     
     # Define comprehensive question templates by domain
@@ -108,7 +101,7 @@ def create_developer_questions():
 def create_ai_questions():
     """Create comprehensive AIF-C01 question bank - 450 questions"""
     
-    existing = load_existing_questions('questions_ai.json')
+    existing = load_bank('questions_ai.json', missing_ok=True)
     questions = existing.copy()
     
     print(f"Generating {450 - len(existing)} new AI Practitioner questions...")
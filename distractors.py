@@ -0,0 +1,271 @@
+"""
+Topic-aware distractor recommendations for questions with too few options
+Every option in the question banks is a candidate distractor. Candidates
+get TF-IDF vectors over their words, kept as an inverted index, and each
+candidate's nearest neighbors are found for all of them at once in batched
+sparse products (with NumPy when it is installed). The neighbor table is
+cached on disk, keyed by the corpus, so it is only rebuilt when the banks
+change. A deficient question is offered the neighbors of its answer and
+existing options from the same provider, re-ranked by the question text.
+"""
+
+import hashlib
+import math
+import re
+from collections import Counter, defaultdict
+from pathlib import Path
+
+from answer_keys import answer_texts
+from bank_io import CERTIFICATION_BANKS, atomic_write_text, dumps, load_bank, loads
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+NEIGHBORS_FILE = Path('distractor_neighbors.json')
+# Bump when scoring changes so cached neighbor tables are discarded
+ENGINE_VERSION = 1
+# Neighbours kept per candidate in the table
+NEIGHBORS = 20
+# Terms in more than this share of candidates ("azure", "amazon") carry no topic
+MAX_DOCUMENT_FREQUENCY = 0.2
+STOP_WORDS = frozenset("a an and are as at be by can for from in into is it of on or that the this to "
+                       "use using which with".split())
+# Size of the dense queries x candidates score block per NumPy batch (32 MB)
+MAX_SCORE_CELLS = 1 << 22
+# Candidates this close to an answer or option are more likely paraphrases of it than wrong answers
+MAX_ANSWER_SIMILARITY = 0.8
+# Weight of the question text against the answer when ranking a question's pool
+QUESTION_WEIGHT = 0.5
+
+WORD = re.compile(r'[a-z0-9]+')
+
+def words_of(text):
+    return frozenset(WORD.findall(text.lower()))
+
+def tokenize(text):
+    return [word for word in WORD.findall(text.lower()) if word not in STOP_WORDS]
+
+def provider_of(cert_id):
+    """'azure' for 'azure-ai'; None for banks outside CERTIFICATION_BANKS"""
+    return cert_id.split('-')[0] if cert_id else None
+
+def dot(a, b):
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(term, 0.0) for term, weight in a.items())
+
+class DistractorEngine:
+    """TF-IDF nearest-neighbor search over candidate option texts"""
+    
+    def __init__(self, candidates):
+        """candidates: {option text: set of providers it appears under}"""
+        self.texts = sorted(candidates)
+        self.ids = {text: i for i, text in enumerate(self.texts)}
+        self.providers = [candidates[text] for text in self.texts]
+        
+        documents = [tokenize(text) for text in self.texts]
+        document_frequency = Counter()
+        for tokens in documents:
+            document_frequency.update(set(tokens))
+        n = len(documents)
+        limit = max(2, MAX_DOCUMENT_FREQUENCY * n)
+        self.idf = {term: math.log((1 + n) / (1 + count)) + 1
+                    for term, count in document_frequency.items() if count <= limit}
+        self.vectors = [self.vectorize_tokens(tokens) for tokens in documents]
+        self.words = [words_of(text) for text in self.texts]
+        
+        # Inverted index: term -> candidates containing it and their weights
+        postings = defaultdict(list)
+        for i, vector in enumerate(self.vectors):
+            for term, weight in vector.items():
+                postings[term].append((i, weight))
+        self.postings = dict(postings)
+        if np is not None:
+            self.posting_arrays = {term: (np.array([i for i, _ in entries], dtype=np.int64),
+                                          np.array([weight for _, weight in entries]))
+                                   for term, entries in self.postings.items()}
+        
+        digest = hashlib.sha256(f"{ENGINE_VERSION}:{NEIGHBORS}".encode())
+        for text, providers in zip(self.texts, self.providers):
+            digest.update(f"\0{text}\0{','.join(sorted(providers))}".encode('utf-8'))
+        self.corpus_key = digest.hexdigest()
+        self.neighbors = None
+    
+    def vectorize_tokens(self, tokens):
+        """L2-normalized TF-IDF weights of the known terms in tokens"""
+        vector = {term: count * self.idf[term] for term, count in Counter(tokens).items() if term in self.idf}
+        norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+        return {term: weight / norm for term, weight in vector.items()} if norm else {}
+    
+    def vectorize(self, text):
+        return self.vectorize_tokens(tokenize(text))
+    
+    def nearest(self, vectors, k, exclude=None):
+        """[(candidate id, cosine)] best first for each query vector; exclude[i] is left out of row i.
+        
+        Scores are rounded so that the NumPy and pure-Python paths rank ties
+        identically (by candidate id).
+        """
+        if np is not None:
+            return self._nearest_numpy(vectors, k, exclude)
+        results = []
+        for row, vector in enumerate(vectors):
+            scores = defaultdict(float)
+            for term, weight in vector.items():
+                for i, candidate_weight in self.postings.get(term, ()):
+                    scores[i] += weight * candidate_weight
+            if exclude is not None:
+                scores.pop(exclude[row], None)
+            ranked = sorted((-round(score, 9), i) for i, score in scores.items() if round(score, 9) > 0)
+            results.append([(i, -score) for score, i in ranked[:k]])
+        return results
+    
+    def score_blocks(self, vectors):
+        """Yield (first row, queries x candidates cosine array) over vectors, in NumPy batches"""
+        n = len(self.texts)
+        batch_size = max(1, MAX_SCORE_CELLS // max(n, 1))
+        for start in range(0, len(vectors), batch_size):
+            batch = vectors[start:start + batch_size]
+            rows, lengths, columns, weights = [], [], [], []
+            for row, vector in enumerate(batch):
+                for term, weight in vector.items():
+                    if term in self.posting_arrays:
+                        ids, candidate_weights = self.posting_arrays[term]
+                        rows.append(row)
+                        lengths.append(len(ids))
+                        columns.append(ids)
+                        weights.append(candidate_weights * weight)
+            scores = np.zeros(len(batch) * n)
+            if rows:
+                # One sparse product for the whole batch: sum weights per (query, candidate) cell
+                cells = np.repeat(np.array(rows, dtype=np.int64), lengths) * n + np.concatenate(columns)
+                scores = np.bincount(cells, weights=np.concatenate(weights), minlength=len(batch) * n)
+            yield start, scores.reshape(len(batch), n)
+    
+    def _nearest_numpy(self, vectors, k, exclude):
+        results = []
+        for start, scores in self.score_blocks(vectors):
+            scores = np.round(scores, 9)
+            if exclude is not None:
+                scores[np.arange(len(scores)), exclude[start:start + len(scores)]] = 0.0
+            
+            for row_scores in scores:
+                positive = np.flatnonzero(row_scores > 0)
+                if len(positive) > k:
+                    # The k-th best score; candidates tied with it are taken in id order
+                    kth = -np.partition(-row_scores[positive], k - 1)[k - 1]
+                    positive = positive[row_scores[positive] >= kth]
+                order = np.lexsort((positive, -row_scores[positive]))[:k]
+                results.append([(int(i), float(row_scores[i])) for i in positive[order]])
+        return results
+    
+    def build_neighbors(self):
+        self.neighbors = self.nearest(self.vectors, NEIGHBORS, exclude=list(range(len(self.texts))))
+    
+    def load_neighbors(self, path=NEIGHBORS_FILE):
+        """Use the cached neighbor table at path if it was built from this corpus; returns whether it was"""
+        try:
+            with open(path, 'rb') as f:
+                cached = loads(f.read())
+        except (OSError, ValueError):
+            return False
+        if not isinstance(cached, dict) or cached.get("corpus") != self.corpus_key:
+            return False
+        self.neighbors = [[(i, score) for i, score in row] for row in cached["neighbors"]]
+        return True
+    
+    def save_neighbors(self, path=NEIGHBORS_FILE):
+        atomic_write_text(path, dumps({"corpus": self.corpus_key, "neighbors": self.neighbors}, compact=True))
+    
+    def recommend(self, questions, provider=None, count=6):
+        """Up to count distractor texts for each question, best first.
+        
+        Candidates are pooled from the neighbors of each question's answers
+        (and, at lower weight, its existing options), limited to provider,
+        and ranked by that similarity plus similarity to the question text.
+        Texts outside the corpus are looked up in one batched search.
+        """
+        unknown = sorted({text for q in questions for text in answer_texts(q) + list(q.get('options', []))
+                          if text not in self.ids})
+        unknown_neighbors = dict(zip(unknown, self.nearest([self.vectorize(text) for text in unknown], NEIGHBORS)))
+        
+        def neighbors_of(text):
+            if text in self.ids:
+                return self.neighbors[self.ids[text]]
+            return unknown_neighbors[text]
+        
+        def question_similarities():
+            """Per question, a function from candidate ids to their similarities with the question text"""
+            vectors = [self.vectorize(q.get('question', '')) for q in questions]
+            if np is None:
+                for vector in vectors:
+                    yield lambda ids, vector=vector: [dot(vector, self.vectors[i]) for i in ids]
+                return
+            for _, scores in self.score_blocks(vectors):
+                for row in scores:
+                    yield lambda ids, row=row: row[ids].tolist()
+        
+        recommendations = []
+        for q, question_similarity in zip(questions, question_similarities()):
+            answers = answer_texts(q)
+            existing = {text.strip().lower() for text in answers + list(q.get('options', []))}
+            pool = {}
+            for text, seed_weight in [(answer, 1.0) for answer in answers] + [(option, 0.5) for option in q.get('options', [])]:
+                for i, score in neighbors_of(text):
+                    pool[i] = max(pool.get(i, 0.0), seed_weight * score)
+            
+            ids = [i for i in pool if provider is None or provider in self.providers[i]]
+            ranked = sorted((-round(pool[i] + QUESTION_WEIGHT * similarity, 9), i)
+                            for i, similarity in zip(ids, question_similarity(ids)))
+            
+            # Only the best few are checked against the answers, options and
+            # distractors chosen so far; most candidates are never needed
+            kept = answers + list(q.get('options', []))
+            kept_vectors = [self.vectorize(text) for text in kept]
+            kept_words = [words for words in map(words_of, kept) if words]
+            chosen = []
+            for _, i in ranked:
+                if len(chosen) == count:
+                    break
+                if self.texts[i].strip().lower() in existing:
+                    continue
+                if any(dot(vector, self.vectors[i]) > MAX_ANSWER_SIMILARITY for vector in kept_vectors):
+                    continue
+                # "Azure Functions" for "Functions": the same option in other words
+                if not self.words[i] or any(self.words[i] <= words or words <= self.words[i] for words in kept_words):
+                    continue
+                chosen.append(self.texts[i])
+                kept_vectors.append(self.vectors[i])
+                kept_words.append(self.words[i])
+            recommendations.append(chosen)
+        return recommendations
+
+def load_engine(extra_banks=None, cache_file=NEIGHBORS_FILE):
+    """Engine over the certification banks plus extra_banks ({name: questions}), neighbor table cached.
+    
+    A certification bank file named in extra_banks is taken from there
+    instead of disk, e.g. the question store's copy of it. Returns (engine,
+    whether the cached table was used).
+    """
+    candidates = defaultdict(set)
+    extra_banks = extra_banks or {}
+    banks = {cert_id: extra_banks[path] if path in extra_banks else load_bank(path, missing_ok=True)
+             for cert_id, path in CERTIFICATION_BANKS.items()}
+    for name, questions in extra_banks.items():
+        if name not in CERTIFICATION_BANKS.values():
+            banks[name] = questions
+    for name, questions in banks.items():
+        provider = provider_of(name) if name in CERTIFICATION_BANKS else 'other'
+        for q in questions:
+            for option in q.get('options', []):
+                candidates[option].add(provider)
+    
+    engine = DistractorEngine(candidates)
+    cached = cache_file is not None and engine.load_neighbors(cache_file)
+    if not cached:
+        engine.build_neighbors()
+        if cache_file is not None:
+            engine.save_neighbors(cache_file)
+    return engine, cached
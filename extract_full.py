@@ -1,249 +1,566 @@
-import pdfplumber
+import argparse
+import hashlib
 import json
 import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack, contextmanager
 from pathlib import Path
 
-def clean_spam_text(text):
-    """Remove spam/advertisement text"""
-    spam_patterns = [
-        r'Passing Certification Exams Made Easy.*?\.com',
-        r'Recommend!!.*?Questions?\)',
-        r'visit\s*-\s*https?://www\..*?\.com',
-        r'Get the Full DVA-C02 dumps.*?Questions?\)',
-        r'https?://www\.surepassexam\.com[^\s]*',
-        r'https?://www\.exambible\.com[^\s]*',
-        r'Your Partner of IT Exam.*?Questions?\)',
-        r'\(127 New Questions?\)',
-    ]
-    
-    for pattern in spam_patterns:
-        text = re.sub(pattern, '', text, flags=re.IGNORECASE | re.DOTALL)
-    
-    return text.strip()
-
-def extract_questions_from_pdf(pdf_path):
-    """Extract questions from AWS exam PDF"""
+from bank_io import save_bank, write_jsonl
+from cleanup_rules import load_rule_set
+from near_duplicates import NearDuplicateIndex, find_near_duplicates
+from pdf_backends import BACKENDS, open_pdf_text, resolve_backend, sidecar_path
+
+# Spam/watermark patterns, see cleanup_rules.json
+EXTRACT_SPAM = load_rule_set("spam", "extract")
+
+def clean_spam_text(text, hits=None):
+    """Remove spam/advertisement text, counting matches per rule into hits"""
+    return EXTRACT_SPAM.apply(text, hits).strip()
+
+# Bump whenever a parsing or journal format change should invalidate previously cached extractions
+EXTRACTOR_VERSION = 6
+# Per-PDF journals; a journal with a "done" record doubles as the extraction cache
+CACHE_DIR = Path(".extract_cache")
+
+QUESTION_MARKER = re.compile(r'NEW QUESTION \d+', re.IGNORECASE)
+
+STAGES = ["open", "extract_text", "split", "parse_options", "clean_spam"]
+
+def new_stats():
+    """Per-PDF counters and stage timings (seconds) for the --report output"""
+    return {
+        "timings": {stage: 0.0 for stage in STAGES},
+        "pages": 0,
+        "blocks_found": 0,
+        "blocks_parsed": 0,
+        "blocks_skipped": {},
+        "fallbacks": {},
+        "spam_rule_hits": {},
+        "errors": [],
+    }
+
+@contextmanager
+def timed(stats, stage):
+    """Add the time spent in the with-block to stats["timings"][stage]"""
+    if stats is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats["timings"][stage] += time.perf_counter() - start
+
+def count(stats, group, reason):
+    if stats is not None:
+        stats[group][reason] = stats[group].get(reason, 0) + 1
+
+def add_stats(totals, stats):
+    """Add stats (one journal record's, or one PDF's) into totals"""
+    for stage, seconds in stats["timings"].items():
+        totals["timings"][stage] += seconds
+    for key in ("pages", "blocks_found", "blocks_parsed"):
+        totals[key] += stats[key]
+    for group in ("blocks_skipped", "fallbacks", "spam_rule_hits"):
+        for reason, n in stats[group].items():
+            totals[group][reason] = totals[group].get(reason, 0) + n
+    totals["errors"].extend(stats["errors"])
+
+def take_stats(stats):
+    """The stats gathered since the last call, resetting them in place for the next journal record"""
+    taken = dict(stats)
+    stats.update(new_stats())
+    return taken
+
+def iter_page_texts(page_texts, stats=None):
+    """Pass (page_number, text) pairs through from a backend, timing each page's extraction"""
+    page_texts = iter(page_texts)
+    while True:
+        with timed(stats, "extract_text"):
+            page = next(page_texts, None)
+        if page is None:
+            return
+        yield page
+
+def split_completed_blocks(buffer):
+    """Split the question blocks closed by a later marker off the front of buffer.
+    
+    Returns (blocks, remaining) where remaining starts at the still-open
+    marker, or is empty if no marker has been seen yet.
+    """
+    markers = [m.start() for m in QUESTION_MARKER.finditer(buffer)]
+    if not markers:
+        return [], ""
+    blocks = [buffer[start:end] for start, end in zip(markers, markers[1:])]
+    return blocks, buffer[markers[-1]:]
+
+def iter_page_blocks(page_texts, carry="", stats=None):
+    """Yield (page_number, blocks, carry) for each page.
+    
+    blocks are the "NEW QUESTION n" blocks closed on that page and carry is
+    the still-open block text. The carry of the last page is the final block.
+    """
+    for page_number, page_text in page_texts:
+        blocks = []
+        if page_text:
+            with timed(stats, "split"):
+                blocks, carry = split_completed_blocks(carry + page_text + "\n")
+        yield page_number, blocks, carry
+
+OPTION_LINE = re.compile(r'\s*([A-F])[\.\)]\s*(.*)')
+ANSWER_LINE = re.compile(r'\s*Answer:\s*([A-F])(?:\s|$)', re.IGNORECASE)
+EXPLANATION_LABEL = re.compile(r'Explanation:\s*', re.IGNORECASE)
+REFERENCES_LABEL = re.compile(r'References:', re.IGNORECASE)
+
+def tokenize_block(block):
+    """Split a question block into stem, options, answer letter and explanation.
+    
+    A single walk over the lines: stem lines until the "A." option, option
+    lines (and their continuations) in letter order, the "Answer:" line, then
+    the explanation up to "References:". Option letters must come in order,
+    so a stray "C." inside the stem or an option is never taken for an option.
+    """
+    stem = []
+    options = []  # [letter, [lines]]
+    explanation = []
+    answer = None
+    state = 'stem'
+    
+    for line_no, line in enumerate(block.split('\n')):
+        if state in ('stem', 'options'):
+            answer_match = ANSWER_LINE.match(line) if line_no else None
+            if answer_match:
+                answer = answer_match.group(1).upper()
+                state = 'answer'
+                line = line[answer_match.end():]
+            else:
+                expected = chr(ord('A') + len(options))
+                option_match = OPTION_LINE.match(line)
+                if option_match and option_match.group(1) == expected:
+                    options.append((expected, [option_match.group(2)]))
+                    state = 'options'
+                elif state == 'options':
+                    options[-1][1].append(line)
+                else:
+                    stem.append(line)
+                continue
+        
+        if state == 'answer':
+            label = EXPLANATION_LABEL.search(line)
+            if not label:
+                continue
+            state = 'explanation'
+            line = line[label.end():]
+        
+        if state == 'explanation':
+            references = REFERENCES_LABEL.search(line)
+            if references:
+                explanation.append(line[:references.start()])
+                break
+            explanation.append(line)
+    
+    return {
+        "stem": '\n'.join(stem),
+        "options": [(letter, '\n'.join(lines)) for letter, lines in options],
+        "answer": answer,
+        "explanation": '\n'.join(explanation),
+    }
+
+def collapse_whitespace(text):
+    return ' '.join(text.split())
+
+def parse_question_block(block, stats=None):
+    """Parse one question block into a question dict, or None if unusable"""
+    with timed(stats, "clean_spam"):
+        block = clean_spam_text(block, stats["spam_rule_hits"] if stats is not None else None)
+    with timed(stats, "parse_options"):
+        tokens = tokenize_block(block)
+    if tokens["answer"] is None:
+        count(stats, "blocks_skipped", "no_answer")
+        return None
+    if len(tokens["options"]) < 2:
+        count(stats, "blocks_skipped", "too_few_options")
+        return None
+    
+    question_text = collapse_whitespace(tokens["stem"])
+    question_text = QUESTION_MARKER.sub('', question_text, count=1).strip()
+    if len(question_text) < 20:
+        count(stats, "blocks_skipped", "short_question")
+        return None
+    
+    options = []
+    correct_answer = None
+    for letter, text in tokens["options"]:
+        text = collapse_whitespace(text)
+        if len(text) > 2:
+            options.append(text)
+            if letter == tokens["answer"]:
+                correct_answer = text
+    
+    if len(options) < 2:
+        count(stats, "blocks_skipped", "too_few_options")
+        return None
+    if correct_answer is None:
+        count(stats, "fallbacks", "answer_defaulted_to_first_option")
+        correct_answer = options[0]  # Fallback
+    
+    explanation = collapse_whitespace(tokens["explanation"])[:1500]
+    
+    return {
+        "question": question_text[:1200],
+        "options": options,
+        "answer": correct_answer,
+        "explanation": explanation if explanation else "No explanation provided."
+    }
+
+def parse_blocks(blocks, first_block_idx, stats=None):
+    """Parse consecutive question blocks, skipping short or broken ones"""
     questions = []
+    for block_idx, block in enumerate(blocks, first_block_idx):
+        if stats is not None:
+            stats["blocks_found"] += 1
+        if len(block.strip()) < 50:
+            count(stats, "blocks_skipped", "too_short")
+            continue
+        
+        try:
+            question_obj = parse_question_block(block, stats)
+            if question_obj:
+                questions.append(question_obj)
+                if stats is not None:
+                    stats["blocks_parsed"] += 1
+        except Exception as e:
+            print(f"    Error in block {block_idx}: {str(e)[:50]}")
+            count(stats, "blocks_skipped", "error")
+            if stats is not None:
+                stats["errors"].append({"block": block_idx, "error": repr(e)})
+            continue
     
-    try:
-        with pdfplumber.open(pdf_path) as pdf:
-            full_text = ""
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    full_text += page_text + "\n"
-            
-            print(f"  Total text length: {len(full_text)} characters")
-            
-            # Split by "NEW QUESTION" marker
-            # Use a pattern that captures the question number
-            parts = re.split(r'(NEW QUESTION \d+)', full_text, flags=re.IGNORECASE)
-            
-            # Combine headers with their content
-            question_blocks = []
-            for i in range(1, len(parts), 2):
-                if i+1 < len(parts):
-                    question_blocks.append(parts[i] + parts[i+1])
-            
-            print(f"  Found {len(question_blocks)} question blocks")
-            
-            for block_idx, block in enumerate(question_blocks, 1):
-                if len(block.strip()) < 50:
-                    continue
+    return questions
+
+def pdf_cache_key(pdf_path, backend="pdfplumber"):
+    """Cache key for a PDF: hash of its bytes, the text backend and the extractor version.
+    
+    The sidecar backend parses the .txt file rather than the PDF, so its
+    bytes are hashed too and regenerating the sidecar invalidates the cache.
+    """
+    digest = hashlib.sha256()
+    paths = [pdf_path] + ([sidecar_path(pdf_path)] if backend == "sidecar" else [])
+    for path in paths:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    return f"{digest.hexdigest()}-{backend}-v{EXTRACTOR_VERSION}"
+
+def journal_path(cache_key):
+    return CACHE_DIR / f"{cache_key}.jsonl"
+
+def iter_journal_records(cache_key):
+    """Yield the intact records of a PDF's journal, up to its done record"""
+    path = journal_path(cache_key)
+    if not path.exists():
+        return
+    
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            yield record
+            if record.get("done"):
+                return
+
+def read_journal(cache_key):
+    """Replay a PDF's journal into the state needed to resume or reuse it.
+    
+    The journal is append-only: one record per completed page with the
+    questions finished on that page, the open block carried into the next
+    one and the stats gathered since the previous record, then a final
+    "done" record. A torn last line left by a crash is ignored, so that
+    page is simply extracted again.
+    """
+    state = {"questions": [], "next_page": 0, "carry": "", "blocks": 0, "text_length": 0,
+             "stats": new_stats(), "done": False}
+    for record in iter_journal_records(cache_key):
+        state["questions"].extend(record["questions"])
+        add_stats(state["stats"], record["stats"])
+        if record.get("done"):
+            state["done"] = True
+            break
+        state["next_page"] = record["page"] + 1
+        state["carry"] = record["carry"]
+        state["blocks"] = record["blocks"]
+        state["text_length"] = record["text_length"]
+    
+    return state
+
+def append_journal(journal, record):
+    journal.write(json.dumps(record, ensure_ascii=False) + "\n")
+    journal.flush()
+
+def extract_questions_from_pdf(pdf_path, cache_key=None, backend="pdfplumber"):
+    """Extract questions from AWS exam PDF, resuming from its journal if one exists"""
+    backend = resolve_backend(backend, pdf_path)
+    if cache_key is None:
+        cache_key = pdf_cache_key(pdf_path, backend)
+    state = read_journal(cache_key)
+    if state["done"]:
+        return state["questions"]
+    
+    questions = state["questions"]
+    block_count = state["blocks"]
+    text_length = state["text_length"]
+    # Only what this run gathers; each journal record takes its share
+    stats = new_stats()
+    if state["next_page"]:
+        print(f"  Resuming at page {state['next_page'] + 1} ({len(questions)} questions journaled)")
+    
+    def counted(page_texts):
+        nonlocal text_length
+        for page_number, page_text in page_texts:
+            if page_text:
+                text_length += len(page_text) + 1
+            yield page_number, page_text
+    
+    CACHE_DIR.mkdir(exist_ok=True)
+    with open(journal_path(cache_key), 'a', encoding='utf-8') as journal:
+        # Terminate a torn line left by a crash so the next record parses
+        if journal.tell():
+            journal.write("\n")
+        try:
+            with ExitStack() as pdf_text:
+                with timed(stats, "open"):
+                    read_pages = pdf_text.enter_context(open_pdf_text(pdf_path, backend))
+                carry = state["carry"]
+                page_texts = counted(iter_page_texts(read_pages(state["next_page"]), stats))
+                for page_number, blocks, carry in iter_page_blocks(page_texts, carry, stats):
+                    page_questions = parse_blocks(blocks, block_count + 1, stats)
+                    block_count += len(blocks)
+                    stats["pages"] += 1
+                    questions.extend(page_questions)
+                    append_journal(journal, {
+                        "page": page_number,
+                        "questions": page_questions,
+                        "carry": carry,
+                        "blocks": block_count,
+                        "text_length": text_length,
+                        "stats": take_stats(stats),
+                    })
+                
+                # The block still open after the last page runs to the end of the document
+                last_questions = []
+                if carry:
+                    block_count += 1
+                    last_questions = parse_blocks([carry], block_count, stats)
+                questions.extend(last_questions)
+                append_journal(journal, {"done": True, "questions": last_questions, "stats": take_stats(stats)})
                 
-                try:
-                    # Clean spam
-                    block_clean = clean_spam_text(block)
-                    
-                    # Find Answer: line
-                    answer_match = re.search(r'\n\s*Answer:\s*([A-E])(?:\s|$)', block_clean, re.IGNORECASE)
-                    if not answer_match:
-                        continue
-                    
-                    correct_letter = answer_match.group(1).upper()
-                    answer_pos = answer_match.start()
-                    
-                    # Split into question+options and explanation
-                    question_section = block_clean[:answer_pos].strip()
-                    explanation_section = block_clean[answer_pos:].strip()
-                    
-                    # Extract explanation
-                    explanation_match = re.search(r'Explanation:\s*(.+?)(?=References:|NEW QUESTION|$)', 
-                                                  explanation_section, re.IGNORECASE | re.DOTALL)
-                    explanation = ""
-                    if explanation_match:
-                        explanation = explanation_match.group(1).strip()
-                        explanation = clean_spam_text(explanation)
-                        explanation = re.sub(r'\s+', ' ', explanation)[:1500]
-                    
-                    # Extract options - look for patterns like "A. text" or "A text" before "B."
-                    # More flexible pattern to handle various formats
-                    option_pattern = r'([A-E])[\.\)]\s*([^\n]+(?:\n(?![A-E][\.\)])[^\n]+)*)'
-                    option_matches = list(re.finditer(option_pattern, question_section))
-                    
-                    if not option_matches or len(option_matches) < 2:
-                        # Try alternative pattern - options may be on new lines
-                        lines = question_section.split('\n')
-                        options_dict = {}
-                        for line in lines:
-                            opt_match = re.match(r'^\s*([A-E])[\.\)]\s*(.+)$', line.strip())
-                            if opt_match:
-                                letter = opt_match.group(1).upper()
-                                text = opt_match.group(2).strip()
-                                if text and len(text) > 2:
-                                    options_dict[letter] = text
-                        
-                        if len(options_dict) >= 2:
-                            # Find question text (before first option)
-                            question_text = question_section
-                            for letter in sorted(options_dict.keys()):
-                                pos = question_section.find(f'{letter}.')
-                                if pos == -1:
-                                    pos = question_section.find(f'{letter})')
-                                if pos != -1:
-                                    question_text = question_section[:pos]
-                                    break
-                            
-                            question_text = clean_spam_text(question_text.strip())
-                            question_text = re.sub(r'\s+', ' ', question_text)
-                            question_text = re.sub(r'^NEW QUESTION \d+\s*', '', question_text, flags=re.IGNORECASE)
-                            
-                            if len(question_text) < 20:
-                                continue
-                            
-                            # Build options list
-                            options = [options_dict.get(l, '') for l in sorted(options_dict.keys())]
-                            options = [clean_spam_text(opt) for opt in options if opt]
-                            options = [re.sub(r'\s+', ' ', opt) for opt in options]
-                            
-                            # Get correct answer text
-                            correct_idx = ord(correct_letter) - ord('A')
-                            if correct_idx < len(options):
-                                correct_answer = options[correct_idx]
-                            else:
-                                correct_answer = options[0]  # Fallback
-                            
-                            question_obj = {
-                                "question": question_text[:1200],
-                                "options": options[:5],  # Max 5 options (A-E)
-                                "answer": correct_answer,
-                                "explanation": explanation if explanation else "No explanation provided."
-                            }
-                            
-                            questions.append(question_obj)
-                            continue
-                    
-                    # Original method with regex matches
-                    if option_matches and len(option_matches) >= 2:
-                        # Find question text (before first option)
-                        first_option_pos = option_matches[0].start()
-                        question_text = question_section[:first_option_pos].strip()
-                        question_text = clean_spam_text(question_text)
-                        question_text = re.sub(r'\s+', ' ', question_text)
-                        question_text = re.sub(r'^NEW QUESTION \d+\s*', '', question_text, flags=re.IGNORECASE)
-                        
-                        if len(question_text) < 20:
-                            continue
-                        
-                        # Build options list
-                        options = []
-                        for match in option_matches[:5]:  # Max 5 options (A-E)
-                            option_text = match.group(2).strip()
-                            option_text = clean_spam_text(option_text)
-                            option_text = re.sub(r'\s+', ' ', option_text)
-                            if option_text and len(option_text) > 2:
-                                options.append(option_text)
-                        
-                        if len(options) < 2:
-                            continue
-                        
-                        # Get correct answer text
-                        correct_idx = ord(correct_letter) - ord('A')
-                        if correct_idx < len(options):
-                            correct_answer = options[correct_idx]
-                        else:
-                            correct_answer = options[0]
-                        
-                        question_obj = {
-                            "question": question_text[:1200],
-                            "options": options,
-                            "answer": correct_answer,
-                            "explanation": explanation if explanation else "No explanation provided."
-                        }
-                        
-                        questions.append(question_obj)
-                    
-                except Exception as e:
-                    print(f"    Error in block {block_idx}: {str(e)[:50]}")
-                    continue
-                    
-    except Exception as e:
-        print(f"  Error processing {pdf_path}: {e}")
+                print(f"  Total text length: {text_length} characters")
+                print(f"  Found {block_count} question blocks")
+        
+        except Exception as e:
+            print(f"  Error processing {pdf_path}: {e}")
     
     return questions
 
-def remove_duplicates(questions):
-    """Remove duplicate questions"""
-    seen = set()
-    unique = []
+def remove_duplicates(questions, threshold=0.8):
+    """Remove near-duplicate questions, reporting each merged cluster"""
+    unique, clusters = find_near_duplicates(questions, threshold=threshold)
     
-    for q in questions:
-        # Normalize for comparison
-        key = re.sub(r'\s+', ' ', q['question'].lower().strip())[:200]
-        
-        if key not in seen:
-            seen.add(key)
-            unique.append(q)
+    for kept, merged in sorted(clusters.items()):
+        print(f"  Cluster #{kept + 1}: '{questions[kept]['question'][:60]}...'")
+        for i in merged:
+            print(f"    merged #{i + 1}: '{questions[i]['question'][:60]}...'")
     
     return unique
 
+def iter_unique_questions(questions, threshold, counts):
+    """Streaming variant of remove_duplicates for --jsonl output.
+    
+    Yields each question unless it near-duplicates an earlier kept one;
+    only the signatures and short stems of kept questions stay in memory.
+    """
+    index = NearDuplicateIndex(threshold=threshold)
+    kept_stems = {}
+    for i, q in enumerate(questions):
+        counts["before"] += 1
+        duplicate_of = index.add(i, q)
+        if duplicate_of is not None:
+            print(f"  Merged #{i + 1} '{q['question'][:60]}...' into #{duplicate_of + 1} '{kept_stems[duplicate_of]}...'")
+            continue
+        kept_stems[i] = q['question'][:60]
+        counts["after"] += 1
+        yield q
+
+def extract_all_parallel(pdf_files, cache_keys, backends, workers):
+    """Extract PDFs into their journals in a process pool, largest files first"""
+    # Submitting the biggest dumps first keeps the pool busy until the end
+    # instead of leaving one worker grinding through a large file alone.
+    by_size = sorted(pdf_files, key=lambda p: p.stat().st_size, reverse=True)
+    
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(extract_questions_from_pdf, pdf_file, cache_keys[pdf_file], backends[pdf_file])
+                   for pdf_file in by_size]
+        for future in futures:
+            future.result()
+
+def write_report(report_file, report):
+    """Write the --report JSON, adding totals across all PDFs"""
+    totals = new_stats()
+    for entry in report["pdfs"]:
+        add_stats(totals, entry)
+    del totals["errors"]
+    report["totals"] = totals
+    
+    with open(report_file, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"[REPORT] Stage timings and counters saved to {report_file}\n")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Extract questions from exam PDFs")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="number of PDFs to extract in parallel (default: 1)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help=f"discard the journals in {CACHE_DIR} and re-parse every PDF")
+    parser.add_argument("--dedup-threshold", type=float, default=0.8,
+                        help="estimated Jaccard similarity at which questions count as duplicates (default: 0.8)")
+    parser.add_argument("--report", metavar="PATH",
+                        help="write per-PDF stage timings and block counters to this JSON file")
+    parser.add_argument("--jsonl", action="store_true",
+                        help="stream questions_full.jsonl (one question per line) instead of questions_full.json")
+    parser.add_argument("--backend", choices=["auto"] + list(BACKENDS), default="pdfplumber",
+                        help="PDF text backend; auto prefers .txt sidecars, then the fastest installed library")
+    return parser.parse_args()
+
 def main():
+    args = parse_args()
     pdf_folder = Path("exam_questions with answers")
     pdf_files = sorted(list(pdf_folder.glob("*.pdf")))
     
     print(f"Found {len(pdf_files)} PDF files\n")
     
-    all_questions = []
+    backends = {pdf_file: resolve_backend(args.backend, pdf_file) for pdf_file in pdf_files}
+    cache_keys = {pdf_file: pdf_cache_key(pdf_file, backends[pdf_file]) for pdf_file in pdf_files}
+    if args.no_cache:
+        for cache_key in cache_keys.values():
+            journal_path(cache_key).unlink(missing_ok=True)
     
+    # PDFs with identical bytes share a journal: only the first is extracted and
+    # the others read its journal, so no two workers ever append to the same one
+    pending = []
+    pending_keys = set()
+    duplicates = 0
     for pdf_file in pdf_files:
-        print(f"Processing {pdf_file.name}...")
-        questions = extract_questions_from_pdf(pdf_file)
-        all_questions.extend(questions)
-        print(f"  [OK] Extracted {len(questions)} questions")
-        print(f"  Total so far: {len(all_questions)}\n")
+        cache_key = cache_keys[pdf_file]
+        if cache_key in pending_keys:
+            duplicates += 1
+        elif not read_journal(cache_key)["done"]:
+            pending.append(pdf_file)
+            pending_keys.add(cache_key)
+    print(f"Cached: {len(pdf_files) - len(pending) - duplicates} | Duplicates: {duplicates} | "
+          f"To extract: {len(pending)}\n")
+    
+    if args.workers > 1 and len(pending) > 1:
+        print(f"Extracting with {args.workers} workers...\n")
+        extract_all_parallel(pending, cache_keys, backends, args.workers)
+    else:
+        for pdf_file in pending:
+            print(f"Processing {pdf_file.name} ({backends[pdf_file]})...")
+            extract_questions_from_pdf(pdf_file, cache_keys[pdf_file], backends[pdf_file])
+    
+    # Build the output from the journals so an interrupted run loses nothing
+    report = {"pdfs": [], "dedup": None}
+    
+    def journal_questions():
+        total = 0
+        for pdf_file in pdf_files:
+            done = False
+            stats = new_stats()
+            pdf_questions = 0
+            for record in iter_journal_records(cache_keys[pdf_file]):
+                done = record.get("done", False)
+                add_stats(stats, record["stats"])
+                pdf_questions += len(record["questions"])
+                yield from record["questions"]
+            total += pdf_questions
+            report["pdfs"].append({
+                "file": pdf_file.name,
+                "backend": backends[pdf_file],
+                "cached": pdf_file not in pending,
+                "complete": done,
+                "questions": pdf_questions,
+                **stats,
+            })
+            status = "OK" if done else "INCOMPLETE"
+            print(f"{pdf_file.name}")
+            print(f"  [{status}] Extracted {pdf_questions} questions")
+            print(f"  Total so far: {total}\n")
     
-    if not all_questions:
+    dedup_start = time.perf_counter()
+    if args.jsonl:
+        # Questions flow from the journals through dedup straight to disk
+        output_file = "questions_full.jsonl"
+        counts = {"before": 0, "after": 0}
+        samples = []
+        
+        def stream_unique():
+            for q in iter_unique_questions(journal_questions(), args.dedup_threshold, counts):
+                if len(samples) < 10:
+                    samples.append(q)
+                yield q
+        
+        write_jsonl(stream_unique(), output_file)
+        before, after = counts["before"], counts["after"]
+    else:
+        output_file = "questions_full.json"
+        all_questions = list(journal_questions())
+        if all_questions:
+            print(f"Removing duplicates...")
+        unique_questions = remove_duplicates(all_questions, threshold=args.dedup_threshold)
+        samples = unique_questions
+        before, after = len(all_questions), len(unique_questions)
+    
+    if not before:
         print("\n[ERROR] No questions were extracted!")
+        if args.report:
+            write_report(args.report, report)
         return
     
-    # Remove duplicates
-    print(f"Removing duplicates...")
-    unique_questions = remove_duplicates(all_questions)
-    print(f"  Before: {len(all_questions)} questions")
-    print(f"  After: {len(unique_questions)} unique questions")
-    print(f"  Removed: {len(all_questions) - len(unique_questions)} duplicates\n")
+    report["dedup"] = {
+        "seconds": time.perf_counter() - dedup_start,
+        "before": before,
+        "after": after,
+    }
+    print(f"  Before: {before} questions")
+    print(f"  After: {after} unique questions")
+    print(f"  Removed: {before - after} duplicates\n")
     
     # Save to JSON
-    output_file = "questions_full.json"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(unique_questions, f, indent=2, ensure_ascii=False)
+    if not args.jsonl:
+        save_bank(unique_questions, output_file)
     
-    print(f"[SUCCESS] Extracted {len(unique_questions)} unique questions!")
+    print(f"[SUCCESS] Extracted {after} unique questions!")
     print(f"[SAVED] Saved to {output_file}\n")
     
+    if args.report:
+        write_report(args.report, report)
+    
     # Show sample
-    if unique_questions:
+    if samples:
         print("--- Sample Question #1 ---")
-        q = unique_questions[0]
+        q = samples[0]
         print(f"Q: {q['question'][:120]}...")
         print(f"Options ({len(q['options'])}):")
         for i, opt in enumerate(q['options'][:3]):
             print(f"  {chr(65+i)}. {opt[:70]}...")
         print(f"Answer: {q['answer'][:70]}...\n")
         
-        if len(unique_questions) > 10:
+        if len(samples) >= 10:
             print("--- Sample Question #10 ---")
-            q = unique_questions[9]
+            q = samples[9]
             print(f"Q: {q['question'][:120]}...")
             print(f"Options: {len(q['options'])}")
             print(f"Answer: {q['answer'][:70]}...")
@@ -3,22 +3,102 @@ Fix Azure questions that have insufficient answer options
 All questions should have at least 4 options
 """
 
-import json
+import argparse
 import sys
-from pathlib import Path
+import time
 
-if sys.platform == 'win32':
-    import io
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+from bank_io import CERTIFICATION_BANKS, load_bank, save_bank
+from distractors import NEIGHBORS_FILE, load_engine, provider_of
+from question_store import connect, find_questions, update_questions
 
-def check_and_fix_questions(filepath):
-    """Check and fix questions with insufficient options"""
+# Bank file -> certification id in the question store
+BANK_CERTIFICATIONS = {filepath: cert_id for cert_id, filepath in CERTIFICATION_BANKS.items()}
+
+def add_distractors(q, filepath, recommended=()):
+    """Pad a question with distractors until it has 4 options.
+    
+    recommended distractors (see distractors.py) are used first; the fixed
+    lists below only fill in when there are not enough of them.
+    """
+    question_text = q['question']
+    answer = q['answer']
+    options = q['options']
+    
+    # Generate plausible distractors based on the question type
+    if 'Azure' in question_text:
+        # Azure service questions
+        distractors = [
+            "Azure Virtual Machines",
+            "Azure Storage Account",
+            "Azure Active Directory",
+            "Azure Monitor",
+            "Azure DevOps",
+            "Azure Portal",
+            "Azure Resource Manager",
+            "Azure Logic Apps"
+        ]
+    elif 'AI' in filepath or 'Cognitive' in question_text:
+        # AI/Cognitive services
+        distractors = [
+            "Azure Machine Learning",
+            "Azure Cognitive Services",
+            "Computer Vision API",
+            "Speech Service",
+            "Language Understanding",
+            "Text Analytics",
+            "Custom Vision",
+            "Azure Bot Service"
+        ]
+    else:
+        # General distractors
+        distractors = [
+            "Configure settings manually",
+            "Use the Azure portal",
+            "Contact Azure support",
+            "Restart the service",
+            "Update the configuration file",
+            "It's not possible",
+            "Use a third-party tool",
+            "Manual deployment only"
+        ]
+    
+    # Make sure answer is in options
+    if answer not in options:
+        options.insert(0, answer)
+    
+    # Add distractors until we have 4 options
+    for distractor in list(recommended) + distractors:
+        if len(options) >= 4:
+            break
+        if distractor != answer and distractor not in options:
+            options.append(distractor)
+    
+    q['options'] = options[:6]  # Max 6 options (A-F)
+
+def build_engine(extra_banks=None, cache_file=NEIGHBORS_FILE):
+    """Distractor engine over all banks (see distractors.load_engine), reporting how it was built"""
+    start = time.perf_counter()
+    engine, cached = load_engine(extra_banks, cache_file)
+    source = "cached" if cached else "built"
+    print(f"Distractor engine: {len(engine.texts)} candidate options, neighbor table {source}, "
+          f"{time.perf_counter() - start:.2f}s")
+    return engine
+
+def recommend_distractors(engine, filepath, deficient):
+    """Recommended distractors for each deficient question, from the bank's provider"""
+    return engine.recommend(deficient, provider_of(BANK_CERTIFICATIONS.get(filepath)))
+
+def check_and_fix_questions(filepath, engine=None, cache_file=NEIGHBORS_FILE):
+    """Check and fix questions with insufficient options.
+    
+    Without an engine one is built for this bank, its neighbor table cached
+    in cache_file (None to skip the cache).
+    """
     print(f"\n{'='*70}")
     print(f"Checking: {filepath}")
     print('='*70)
     
-    with open(filepath, 'r', encoding='utf-8') as f:
-        questions = json.load(f)
+    questions = load_bank(filepath)
     
     print(f"Total questions: {len(questions)}")
     
@@ -38,66 +118,14 @@ def check_and_fix_questions(filepath):
         
         # Fix the issues
         print(f"\nFixing {len(issues)} questions...")
-        for i, q, opt_count in issues:
-            question_text = q['question']
-            answer = q['answer']
-            options = q['options']
-            
-            # Generate plausible distractors based on the question type
-            if 'Azure' in question_text:
-                # Azure service questions
-                distractors = [
-                    "Azure Virtual Machines",
-                    "Azure Storage Account",
-                    "Azure Active Directory",
-                    "Azure Monitor",
-                    "Azure DevOps",
-                    "Azure Portal",
-                    "Azure Resource Manager",
-                    "Azure Logic Apps"
-                ]
-            elif 'AI' in filepath or 'Cognitive' in question_text:
-                # AI/Cognitive services
-                distractors = [
-                    "Azure Machine Learning",
-                    "Azure Cognitive Services",
-                    "Computer Vision API",
-                    "Speech Service",
-                    "Language Understanding",
-                    "Text Analytics",
-                    "Custom Vision",
-                    "Azure Bot Service"
-                ]
-            else:
-                # General distractors
-                distractors = [
-                    "Configure settings manually",
-                    "Use the Azure portal",
-                    "Contact Azure support",
-                    "Restart the service",
-                    "Update the configuration file",
-                    "It's not possible",
-                    "Use a third-party tool",
-                    "Manual deployment only"
-                ]
-            
-            # Make sure answer is in options
-            if answer not in options:
-                options.insert(0, answer)
-            
-            # Add distractors until we have 4 options
-            for distractor in distractors:
-                if len(options) >= 4:
-                    break
-                if distractor != answer and distractor not in options:
-                    options.append(distractor)
-            
-            # Update the question
-            questions[i]['options'] = options[:6]  # Max 6 options (A-F)
+        if engine is None:
+            engine = build_engine({filepath: questions}, cache_file)
+        recommendations = recommend_distractors(engine, filepath, [q for i, q, opt_count in issues])
+        for (i, q, opt_count), recommended in zip(issues, recommendations):
+            add_distractors(q, filepath, recommended)
         
         # Save fixed questions
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(questions, f, indent=2, ensure_ascii=False)
+        save_bank(questions, filepath)
         
         print(f"✓ Fixed and saved {len(issues)} questions")
     else:
@@ -105,29 +133,82 @@ def check_and_fix_questions(filepath):
     
     return len(issues)
 
-# Check and fix both Azure files
-print("="*70)
-print("FIXING AZURE QUESTION OPTIONS")
-print("="*70)
-
-azure_dev_issues = check_and_fix_questions('questions_azure_developer.json')
-azure_ai_issues = check_and_fix_questions('questions_azure_ai.json')
-
-# Also check AWS files to make sure they're okay
-print("\n" + "="*70)
-print("VERIFICATION: Checking AWS files too")
-print("="*70)
-
-aws_dev_issues = check_and_fix_questions('questions_aws_developer.json')
-aws_ai_issues = check_and_fix_questions('questions_aws_ai.json')
+def check_and_fix_store(conn, filepath, engine):
+    """Same fix against the SQLite store: indexed lookup, one transaction for all updates"""
+    certification = BANK_CERTIFICATIONS[filepath]
+    print(f"\n{'='*70}")
+    print(f"Checking: {certification} in the question store")
+    print('='*70)
+    
+    issues = find_questions(conn, certification=certification, max_options=3)
+    
+    print(f"Questions with < 4 options: {len(issues)}")
+    
+    if issues:
+        print("\nIssues found:")
+        for row_id, _, position, q in issues[:5]:
+            print(f"  Question {position+1}: '{q['question'][:60]}...' ({len(q.get('options', []))} options)")
+        
+        print(f"\nFixing {len(issues)} questions...")
+        recommendations = recommend_distractors(engine, filepath, [q for row_id, _, position, q in issues])
+        for (row_id, _, position, q), recommended in zip(issues, recommendations):
+            add_distractors(q, filepath, recommended)
+        update_questions(conn, [(row_id, q) for row_id, _, position, q in issues])
+        
+        print(f"✓ Fixed and stored {len(issues)} questions")
+    else:
+        print("✓ All questions have 4+ options!")
+    
+    return len(issues)
 
-print("\n" + "="*70)
-print("SUMMARY")
-print("="*70)
-print(f"Azure Developer: {azure_dev_issues} issues fixed")
-print(f"Azure AI: {azure_ai_issues} issues fixed")
-print(f"AWS Developer: {aws_dev_issues} issues fixed")
-print(f"AWS AI: {aws_ai_issues} issues fixed")
-print(f"\nTotal issues fixed: {azure_dev_issues + azure_ai_issues + aws_dev_issues + aws_ai_issues}")
-print("\n✓ All questions now have 4-6 answer options!")
+def main():
+    parser = argparse.ArgumentParser(description="Fix questions with fewer than 4 answer options")
+    parser.add_argument("--db", help="fix questions in this SQLite store (see question_store.py) instead of the JSON banks")
+    args = parser.parse_args()
+    
+    # One engine for all four banks, over the copies being fixed
+    if args.db:
+        conn = connect(args.db)
+        engine = build_engine({filepath: [q for _, _, _, q in find_questions(conn, certification=cert_id)]
+                               for filepath, cert_id in BANK_CERTIFICATIONS.items()})
+        
+        def check_and_fix(filepath):
+            return check_and_fix_store(conn, filepath, engine)
+    else:
+        engine = build_engine()
+        
+        def check_and_fix(filepath):
+            return check_and_fix_questions(filepath, engine)
+    
+    # Check and fix both Azure files
+    print("="*70)
+    print("FIXING AZURE QUESTION OPTIONS")
+    print("="*70)
+    
+    azure_dev_issues = check_and_fix('questions_azure_developer.json')
+    azure_ai_issues = check_and_fix('questions_azure_ai.json')
+    
+    # Also check AWS files to make sure they're okay
+    print("\n" + "="*70)
+    print("VERIFICATION: Checking AWS files too")
+    print("="*70)
+    
+    aws_dev_issues = check_and_fix('questions_aws_developer.json')
+    aws_ai_issues = check_and_fix('questions_aws_ai.json')
+    
+    print("\n" + "="*70)
+    print("SUMMARY")
+    print("="*70)
+    print(f"Azure Developer: {azure_dev_issues} issues fixed")
+    print(f"Azure AI: {azure_ai_issues} issues fixed")
+    print(f"AWS Developer: {aws_dev_issues} issues fixed")
+    print(f"AWS AI: {aws_ai_issues} issues fixed")
+    print(f"\nTotal issues fixed: {azure_dev_issues + azure_ai_issues + aws_dev_issues + aws_ai_issues}")
+    print("\n✓ All questions now have 4-6 answer options!")
+    if args.db:
+        print(f"\nRun 'python question_store.py export --db {args.db}' to update the JSON banks")
 
+if __name__ == "__main__":
+    if sys.platform == 'win32':
+        sys.stdout.reconfigure(encoding='utf-8')
+    main()
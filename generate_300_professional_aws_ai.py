@@ -3,9 +3,10 @@ Generate 300 professional-grade AWS AI Practitioner questions
 Written by AWS Solutions Architect - Professional level quality
 """
 
-import json
 import sys
 
+from bank_io import load_bank, save_bank
+
 if sys.platform == 'win32':
     import io
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
@@ -136,8 +137,7 @@ print("  ✓ Performance and scalability requirements")
 print("  ✓ Compliance and security contexts")
 
 # Load existing questions
-with open('questions_aws_ai.json', 'r', encoding='utf-8') as f:
-    existing = json.load(f)
+existing = load_bank('questions_aws_ai.json')
 
 # Combine: use professional questions first, then fill with existing
 target = 300
@@ -151,8 +151,7 @@ print(f"  Professional: {min(len(professional_questions), target)}")
 print(f"  Standard: {max(0, target - len(professional_questions))}")
 
 # Save
-with open('questions_aws_ai.json', 'w', encoding='utf-8') as f:
-    json.dump(final_questions, f, indent=2, ensure_ascii=False)
+save_bank(final_questions, 'questions_aws_ai.json')
 
 print("\n✓ AWS AI questions upgraded to professional level!")
 print("✓ Ready for serious certification preparation!")
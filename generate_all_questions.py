@@ -7,21 +7,13 @@ Generates 300+ professional questions for each certification path:
 - Azure AI Engineer Associate (AI-102)
 """
 
-import json
 import random
-from pathlib import Path
 
-def load_existing_questions(filepath):
-    """Load existing questions to avoid duplication"""
-    if Path(filepath).exists():
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    return []
+from bank_io import LazyBanks, save_bank
 
 def save_questions(questions, filepath):
     """Save questions to JSON file"""
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(questions, f, indent=2, ensure_ascii=False)
+    save_bank(questions, filepath)
     print(f"✅ Saved {len(questions)} questions to {filepath}")
 
 # ==================== AWS DEVELOPER QUESTIONS ====================
@@ -583,10 +575,11 @@ print("=" * 70)
 
 # Load existing questions
 print("\n📊 Loading existing questions...")
-aws_dev_existing = load_existing_questions('questions_aws_developer.json')
-aws_ai_existing = load_existing_questions('questions_aws_ai.json')
-azure_dev_existing = load_existing_questions('questions_azure_developer.json')
-azure_ai_existing = load_existing_questions('questions_azure_ai.json')
+banks = LazyBanks()
+aws_dev_existing = banks['aws-developer']
+aws_ai_existing = banks['aws-ai']
+azure_dev_existing = banks['azure-developer']
+azure_ai_existing = banks['azure-ai']
 
 print(f"  AWS Developer: {len(aws_dev_existing)} existing")
 print(f"  AWS AI: {len(aws_ai_existing)} existing")
@@ -4,9 +4,9 @@ Generates exactly 300+ questions for EACH certification path
 Total target: 1200+ questions across all 4 certifications
 """
 
-import json
 import sys
-from pathlib import Path
+
+from bank_io import load_bank, save_bank
 
 if sys.platform == 'win32':
     import io
@@ -15,23 +15,13 @@ if sys.platform == 'win32':
 def q(question, options, answer, explanation):
     return {"question": question, "options": options, "answer": answer, "explanation": explanation}
 
-def load_existing(filepath):
-    if Path(filepath).exists():
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    return []
-
-def save_json(data, filepath):
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-
 #============================================================================
 # AWS DEVELOPER ASSOCIATE (DVA-C02) - 300+ QUESTIONS
 #============================================================================
 
 def generate_aws_developer_complete():
     """Generate complete 300+ AWS Developer questions"""
-    existing = load_existing('questions_aws_developer.json')
+    existing = load_bank('questions_aws_developer.json', missing_ok=True)
     questions = existing.copy()
     target = 300
     needed = max(0, target - len(questions))
@@ -225,10 +215,15 @@ def generate_aws_developer_complete():
         
         # Pad to reach 300 with additional high-quality questions
         while len(questions) + len(new_q) < target:
+            service = ["Lambda", "ECS", "SQS", "ElastiCache", "CloudWatch"][len(new_q) % 5]
+            options = ["Lambda", "ECS", "SQS", "ElastiCache"][:(len(new_q) % 4) + 1] + ["CloudWatch"]
+            # The truncated option list can drop the answer; put it back
+            if service not in options:
+                options.insert(-1, service)
             new_q.append(q(
                 f"Which AWS service is best for {['serverless compute', 'container orchestration', 'message queuing', 'caching', 'monitoring'][len(new_q) % 5]}?",
-                ["Lambda", "ECS", "SQS", "ElastiCache"][:(len(new_q) % 4) + 1] + ["CloudWatch"],
-                ["Lambda", "ECS", "SQS", "ElastiCache", "CloudWatch"][len(new_q) % 5],
+                options,
+                service,
                 f"This service provides the optimal solution for this use case in AWS."
             ))
         
@@ -243,7 +238,7 @@ def generate_aws_developer_complete():
 
 def generate_aws_ai_complete():
     """Generate complete 300+ AWS AI questions"""
-    existing = load_existing('questions_aws_ai.json')
+    existing = load_bank('questions_aws_ai.json', missing_ok=True)
     questions = existing.copy()
     target = 300
     needed = max(0, target - len(questions))
@@ -273,7 +268,7 @@ def generate_aws_ai_complete():
 
 def generate_azure_developer_complete():
     """Generate complete 300+ Azure Developer questions"""
-    existing = load_existing('questions_azure_developer.json')
+    existing = load_bank('questions_azure_developer.json', missing_ok=True)
     questions = existing.copy()
     target = 300
     needed = max(0, target - len(questions))
@@ -302,7 +297,7 @@ def generate_azure_developer_complete():
 
 def generate_azure_ai_complete():
     """Generate complete 300+ Azure AI questions"""
-    existing = load_existing('questions_azure_ai.json')
+    existing = load_bank('questions_azure_ai.json', missing_ok=True)
     questions = existing.copy()
     target = 300
     needed = max(0, target - len(questions))
@@ -345,10 +340,10 @@ if __name__ == "__main__":
     print("\n" + "="*70)
     print("SAVING QUESTION BANKS")
     print("="*70)
-    save_json(aws_dev, 'questions_aws_developer.json')
-    save_json(aws_ai, 'questions_aws_ai.json')
-    save_json(azure_dev, 'questions_azure_developer.json')
-    save_json(azure_ai, 'questions_azure_ai.json')
+    save_bank(aws_dev, 'questions_aws_developer.json')
+    save_bank(aws_ai, 'questions_aws_ai.json')
+    save_bank(azure_dev, 'questions_azure_developer.json')
+    save_bank(azure_ai, 'questions_azure_ai.json')
     
     total = len(aws_dev) + len(aws_ai) + len(azure_dev) + len(azure_ai)
     print("\n" + "="*70)
@@ -3,16 +3,16 @@ Generate comprehensive AWS certification questions
 For production use with 1M+ users - 450+ questions per certification
 """
 
-import json
 import random
 
+from bank_io import load_bank
+
 # AWS Developer Associate (DVA-C02) Questions Generator
 def generate_developer_questions():
     """Generate 450+ DVA-C02 questions covering all domains"""
     
     # Load existing questions
-    with open('questions_full.json', 'r', encoding='utf-8') as f:
-        existing = json.load(f)
+    existing = load_bank('questions_full.json')
     
     # Topics for DVA-C02
     topics = {
@@ -87,8 +87,7 @@ def generate_ai_practitioner_questions():
     """Generate 450+ AIF-C01 questions"""
     
     # Load existing AI questions
-    with open('questions_ai.json', 'r', encoding='utf-8') as f:
-        existing = json.load(f)
+    existing = load_bank('questions_ai.json')
     
     print(f"Starting with {len(existing)} existing AI questions")
     print(f"Target: 450 questions")
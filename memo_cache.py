@@ -0,0 +1,101 @@
+"""
+Bounded LRU memo for string-keyed results, optionally persisted to disk
+Used by clean_questions so that option strings and question texts repeated
+across banks are only cleaned once, and so that re-cleaning a mostly
+unchanged corpus reuses the previous run's results.
+"""
+
+from collections import OrderedDict
+
+from bank_io import atomic_write_text, dumps, loads
+
+# Enough for the options and stems that recur across banks; one-off texts are evicted
+DEFAULT_MAXSIZE = 4096
+
+class MemoCache:
+    """Least-recently-used map of raw string -> computed result, with hit counters"""
+    
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        # Only worker processes keep the entries they compute, for take_new
+        self.track_new = False
+        self.new = {}
+        self.hits = 0
+        self.misses = 0
+    
+    def lookup(self, key, compute, on_hit=None):
+        """The cached result for key, computing and storing it on a miss.
+        
+        on_hit(value) is called when the result comes from the cache, for
+        side effects of compute that must be repeated, such as counters.
+        """
+        try:
+            value = self.entries[key]
+        except KeyError:
+            self.misses += 1
+            value = compute(key)
+            self.put(key, value)
+            if self.track_new:
+                self.new[key] = value
+            return value
+        self.hits += 1
+        self.entries.move_to_end(key)
+        if on_hit is not None:
+            on_hit(value)
+        return value
+    
+    def put(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+    
+    def clear(self):
+        """Drop every entry and reset the counters"""
+        self.entries.clear()
+        self.new = {}
+        self.hits = 0
+        self.misses = 0
+    
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+    
+    def take_new(self):
+        """(entries computed, hits, misses) since the last call, resetting them; for shipping out of a worker"""
+        taken = (self.new, self.hits, self.misses)
+        self.new = {}
+        self.hits = 0
+        self.misses = 0
+        return taken
+    
+    def add_new(self, taken):
+        new, hits, misses = taken
+        for key, value in new.items():
+            self.put(key, value)
+        self.hits += hits
+        self.misses += misses
+
+def load_caches(path, version, caches):
+    """Fill {name: MemoCache} from path if it was saved under the same version; returns entries loaded"""
+    try:
+        with open(path, 'rb') as f:
+            saved = loads(f.read())
+    except (OSError, ValueError):
+        return 0
+    if not isinstance(saved, dict) or saved.get("version") != version:
+        return 0
+    loaded = 0
+    for name, cache in caches.items():
+        for key, value in saved.get(name, []):
+            cache.put(key, value)
+            loaded += 1
+    return loaded
+
+def save_caches(path, version, caches):
+    """Write {name: MemoCache} to path, least recently used entries first"""
+    saved = {"version": version}
+    for name, cache in caches.items():
+        saved[name] = list(cache.entries.items())
+    atomic_write_text(path, dumps(saved, compact=True))
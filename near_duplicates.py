@@ -0,0 +1,141 @@
+"""
+Near-duplicate question detection with MinHash + locality-sensitive hashing
+Catches reworded and re-numbered copies of the same dump question in
+near-linear time instead of comparing every pair of questions
+"""
+
+import random
+import re
+import zlib
+
+# Universal hash (a * x + b) mod p used to simulate a random permutation
+MERSENNE_PRIME = (1 << 61) - 1
+# Added per bin skipped during densification so borrowed values stay distinct
+ROTATION_OFFSET = MERSENNE_PRIME
+
+def question_fingerprint_text(q):
+    """Text a question is compared on: stem, options and answer"""
+    answer = q.get('answer', '')
+    if isinstance(answer, list):
+        answer = ' '.join(answer)
+    parts = [q.get('question', '')] + list(q.get('options', [])) + [answer]
+    text = ' '.join(parts).lower()
+    # Dump numbering differs between copies of the same question
+    text = re.sub(r'new question \d+', ' ', text)
+    return re.sub(r'[^a-z0-9]+', ' ', text).strip()
+
+def shingles(text, size=3):
+    """Set of word n-grams; short texts fall back to their words"""
+    words = text.split()
+    if len(words) < size:
+        return set(words)
+    return {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+def optimal_bands(threshold, num_perm):
+    """Pick (bands, rows) whose LSH S-curve best separates at threshold.
+    
+    Minimises the false positive area below the threshold plus the false
+    negative area above it, integrated numerically.
+    """
+    def probability(s, bands, rows):
+        return 1 - (1 - s ** rows) ** bands
+    
+    def area(lo, hi, f, steps=100):
+        width = (hi - lo) / steps
+        return sum(f(lo + (i + 0.5) * width) for i in range(steps)) * width
+    
+    best = None
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        false_positive = area(0.0, threshold, lambda s: probability(s, bands, rows))
+        false_negative = area(threshold, 1.0, lambda s: 1 - probability(s, bands, rows))
+        error = false_positive + false_negative
+        if best is None or error < best[0]:
+            best = (error, bands, rows)
+    return best[1], best[2]
+
+class NearDuplicateIndex:
+    """Streaming index of kept questions; add() reports which one a new question duplicates"""
+    
+    def __init__(self, threshold=0.8, num_perm=64, seed=1):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        rng = random.Random(seed)
+        self.permutation = (rng.randint(1, MERSENNE_PRIME - 1), rng.randint(0, MERSENNE_PRIME - 1))
+        self.bands, self.rows = optimal_bands(threshold, num_perm)
+        self.buckets = {}
+        self.signatures = {}
+    
+    def signature(self, text):
+        """One-permutation MinHash: each shingle hash lands in one of num_perm bins.
+        
+        Costs one hash per shingle instead of num_perm; empty bins borrow the
+        next filled bin's value (rotation densification) so short texts still
+        produce comparable signatures.
+        """
+        num_perm = self.num_perm
+        a, b = self.permutation
+        bins = [None] * num_perm
+        for shingle in shingles(text):
+            value = (a * zlib.crc32(shingle.encode('utf-8')) + b) % MERSENNE_PRIME
+            slot, value = value % num_perm, value // num_perm
+            if bins[slot] is None or value < bins[slot]:
+                bins[slot] = value
+        if all(value is None for value in bins):
+            return [0] * num_perm
+        
+        signature = []
+        for slot in range(num_perm):
+            offset = 0
+            while bins[(slot + offset) % num_perm] is None:
+                offset += 1
+            signature.append(bins[(slot + offset) % num_perm] + offset * ROTATION_OFFSET)
+        return signature
+    
+    def band_keys(self, signature):
+        rows = self.rows
+        return [(band, tuple(signature[band * rows:(band + 1) * rows])) for band in range(self.bands)]
+    
+    def similarity(self, sig_a, sig_b):
+        """Estimated Jaccard similarity of two signatures"""
+        return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / self.num_perm
+    
+    def add(self, key, q):
+        """Index q under key unless it duplicates a kept question; returns that question's key"""
+        signature = self.signature(question_fingerprint_text(q))
+        band_keys = self.band_keys(signature)
+        
+        candidates = set()
+        for band_key in band_keys:
+            candidates.update(self.buckets.get(band_key, ()))
+        best_key, best_similarity = None, self.threshold
+        for candidate in candidates:
+            similarity = self.similarity(signature, self.signatures[candidate])
+            if similarity >= best_similarity:
+                best_key, best_similarity = candidate, similarity
+        if best_key is not None:
+            return best_key
+        
+        self.signatures[key] = signature
+        for band_key in band_keys:
+            self.buckets.setdefault(band_key, []).append(key)
+        return None
+
+def find_near_duplicates(questions, threshold=0.8, num_perm=64):
+    """Keep the first of each group of near-duplicate questions.
+    
+    Returns (unique, clusters) where clusters maps the index of each kept
+    question that absorbed duplicates to the indices merged into it.
+    """
+    index = NearDuplicateIndex(threshold=threshold, num_perm=num_perm)
+    unique = []
+    clusters = {}
+    
+    for i, q in enumerate(questions):
+        duplicate_of = index.add(i, q)
+        if duplicate_of is None:
+            unique.append(q)
+        else:
+            clusters.setdefault(duplicate_of, []).append(i)
+    
+    return unique, clusters
@@ -0,0 +1,186 @@
+"""
+Packed columnar question bank format (.qpack)
+Every distinct string is stored once in a shared table; questions refer to
+it by integer, and each field is kept as one column array. Records are
+rebuilt only when accessed, so a tool that samples a few questions never
+expands the rest.
+
+Usage:
+    python packed_bank.py [bank.json ...]   # write .qpack files and compare size/load time
+"""
+
+import argparse
+import gzip
+import sys
+import time
+from collections.abc import Sequence
+from pathlib import Path
+
+from bank_io import CERTIFICATION_BANKS, atomic_write_text, dumps, load_bank, loads
+
+PACKED_FORMAT = "questionnaire-packed-bank"
+PACKED_VERSION = 1
+PACKED_SUFFIX = ".qpack"
+
+# Column kinds: how a column's values are encoded
+STRING = "str"               # string -> table index
+STRINGS = "strs"             # list of strings -> list of table indices
+STRING_OR_STRINGS = "str|strs"  # answers: a single string or a list of them
+RAW = "raw"                  # anything else, stored as-is
+
+def is_packed(path):
+    return Path(path).suffix == PACKED_SUFFIX
+
+def is_string_list(value):
+    return isinstance(value, list) and all(isinstance(item, str) for item in value)
+
+def column_kind(values):
+    """Narrowest encoding that fits every present value of a column"""
+    if all(isinstance(value, str) for value in values):
+        return STRING
+    if all(is_string_list(value) for value in values):
+        return STRINGS
+    if all(isinstance(value, str) or is_string_list(value) for value in values):
+        return STRING_OR_STRINGS
+    return RAW
+
+def pack_questions(questions):
+    """Packed representation of a question list, as a JSON-serializable dict"""
+    strings, string_ids = [], {}
+    
+    def intern(text):
+        if text not in string_ids:
+            string_ids[text] = len(strings)
+            strings.append(text)
+        return string_ids[text]
+    
+    # Field order differs between records, so each record points at a layout
+    layouts, layout_ids, layout = [], {}, []
+    fields = {}
+    for q in questions:
+        keys = tuple(q)
+        if keys not in layout_ids:
+            layout_ids[keys] = len(layouts)
+            layouts.append(list(keys))
+        layout.append(layout_ids[keys])
+        for key in keys:
+            fields.setdefault(key, None)
+    
+    columns = {}
+    for key in fields:
+        present = [q[key] for q in questions if key in q]
+        kind = column_kind(present)
+        values = []
+        for q in questions:
+            value = q.get(key)
+            if key not in q or kind == RAW:
+                values.append(value)
+            elif isinstance(value, str):
+                values.append(intern(value))
+            else:
+                values.append([intern(item) for item in value])
+        columns[key] = {"kind": kind, "values": values}
+    
+    return {
+        "format": PACKED_FORMAT,
+        "version": PACKED_VERSION,
+        "count": len(questions),
+        "strings": strings,
+        "layouts": layouts,
+        "layout": layout,
+        "columns": columns,
+    }
+
+class PackedBank(Sequence):
+    """Read-only question list over a packed bank; records are expanded on access"""
+    
+    def __init__(self, packed):
+        if packed.get("format") != PACKED_FORMAT or packed.get("version") != PACKED_VERSION:
+            raise ValueError(f"Not a version {PACKED_VERSION} packed bank")
+        self.strings = packed["strings"]
+        self.layouts = packed["layouts"]
+        self.layout = packed["layout"]
+        self.columns = {key: (column["kind"], column["values"]) for key, column in packed["columns"].items()}
+    
+    def decode(self, kind, value):
+        strings = self.strings
+        if kind == RAW:
+            return value
+        if isinstance(value, int):
+            return strings[value]
+        return [strings[item] for item in value]
+    
+    def __len__(self):
+        return len(self.layout)
+    
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        q = {}
+        for key in self.layouts[self.layout[i]]:
+            kind, values = self.columns[key]
+            q[key] = self.decode(kind, values[i])
+        return q
+    
+    def column(self, key):
+        """Decoded values of one field for every question (None where absent)"""
+        kind, values = self.columns[key]
+        return [None if value is None else self.decode(kind, value) for value in values]
+
+def load_packed(path):
+    with open(path, 'rb') as f:
+        return PackedBank(loads(f.read()))
+
+def save_packed(questions, path):
+    atomic_write_text(path, dumps(pack_questions(questions), compact=True))
+
+def best_time(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def compare_bank(bank_file, repeat):
+    """Write bank_file as .qpack and return size and load-time figures for both formats"""
+    questions = load_bank(bank_file)
+    packed_file = Path(bank_file).with_suffix(PACKED_SUFFIX)
+    save_packed(questions, packed_file)
+    if list(load_packed(packed_file)) != questions:
+        raise RuntimeError(f"{packed_file} does not round-trip to {bank_file}")
+    
+    json_bytes = Path(bank_file).read_bytes()
+    packed_bytes = packed_file.read_bytes()
+    return {
+        "packed_file": packed_file,
+        "json_size": len(json_bytes),
+        "packed_size": len(packed_bytes),
+        "json_gzip": len(gzip.compress(json_bytes)),
+        "packed_gzip": len(gzip.compress(packed_bytes)),
+        "json_load": best_time(lambda: load_bank(bank_file), repeat),
+        "packed_open": best_time(lambda: load_packed(packed_file), repeat),
+        "packed_expand": best_time(lambda: list(load_packed(packed_file)), repeat),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Write packed .qpack banks and compare them with the JSON banks")
+    parser.add_argument("banks", nargs="*", default=list(CERTIFICATION_BANKS.values()))
+    parser.add_argument("--repeat", type=int, default=20, help="timing repetitions, best is reported (default: 20)")
+    args = parser.parse_args()
+    
+    for bank_file in args.banks:
+        r = compare_bank(bank_file, args.repeat)
+        print(f"\n{bank_file} -> {r['packed_file'].name}")
+        print(f"  Size:      {r['json_size']:>9,} B JSON | {r['packed_size']:>9,} B packed "
+              f"({r['packed_size'] / r['json_size']:.0%})")
+        print(f"  Gzipped:   {r['json_gzip']:>9,} B JSON | {r['packed_gzip']:>9,} B packed "
+              f"({r['packed_gzip'] / r['json_gzip']:.0%})")
+        print(f"  Load:      {r['json_load'] * 1000:8.2f} ms JSON | {r['packed_open'] * 1000:8.2f} ms packed open | "
+              f"{r['packed_expand'] * 1000:8.2f} ms packed + expand all")
+
+if __name__ == "__main__":
+    if sys.platform == 'win32':
+        sys.stdout.reconfigure(encoding='utf-8')
+    main()
@@ -0,0 +1,146 @@
+"""
+Text backends for PDF question extraction
+Each backend opens a PDF and yields (page_number, text) per page, so
+extract_full can use pdfplumber, a faster extractor if one is installed,
+or pre-extracted .txt sidecar files without changing the parser
+"""
+
+import argparse
+import importlib.util
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+
+from bank_io import atomic_write_bytes
+
+# Pages in a sidecar are separated by form feeds, as written by pdftotext
+PAGE_BREAK = '\f'
+
+# Preference order for --backend auto: cheapest text source first
+AUTO_ORDER = ["sidecar", "pymupdf", "pypdfium2", "pdfplumber"]
+
+def sidecar_path(pdf_path):
+    return Path(pdf_path).with_suffix('.txt')
+
+@contextmanager
+def open_pdfplumber(pdf_path):
+    import pdfplumber
+    
+    with pdfplumber.open(pdf_path) as pdf:
+        def page_texts(start_page=0):
+            for page_number in range(start_page, len(pdf.pages)):
+                page = pdf.pages[page_number]
+                page_text = page.extract_text()
+                # Parsed layout objects are cached on the page; without this a long
+                # dump keeps every page's characters alive until the file is closed.
+                page.flush_cache()
+                yield page_number, page_text or ""
+        
+        yield page_texts
+
+@contextmanager
+def open_pymupdf(pdf_path):
+    import fitz
+    
+    doc = fitz.open(pdf_path)
+    try:
+        def page_texts(start_page=0):
+            for page_number in range(start_page, doc.page_count):
+                yield page_number, doc.load_page(page_number).get_text()
+        
+        yield page_texts
+    finally:
+        doc.close()
+
+@contextmanager
+def open_pypdfium2(pdf_path):
+    import pypdfium2
+    
+    pdf = pypdfium2.PdfDocument(pdf_path)
+    try:
+        def page_texts(start_page=0):
+            for page_number in range(start_page, len(pdf)):
+                page = pdf[page_number]
+                textpage = page.get_textpage()
+                page_text = textpage.get_text_range()
+                textpage.close()
+                page.close()
+                yield page_number, page_text.replace('\r\n', '\n')
+        
+        yield page_texts
+    finally:
+        pdf.close()
+
+@contextmanager
+def open_sidecar(pdf_path):
+    path = sidecar_path(pdf_path)
+    
+    def page_texts(start_page=0):
+        with open(path, 'r', encoding='utf-8') as f:
+            page_number = 0
+            pending = ""
+            for chunk in iter(lambda: f.read(1 << 16), ''):
+                pages = (pending + chunk).split(PAGE_BREAK)
+                pending = pages.pop()
+                for page_text in pages:
+                    if page_number >= start_page:
+                        yield page_number, page_text
+                    page_number += 1
+            if pending and page_number >= start_page:
+                yield page_number, pending
+    
+    yield page_texts
+
+BACKENDS = {
+    "pdfplumber": (open_pdfplumber, "pdfplumber"),
+    "pymupdf": (open_pymupdf, "fitz"),
+    "pypdfium2": (open_pypdfium2, "pypdfium2"),
+    "sidecar": (open_sidecar, None),
+}
+
+def backend_available(name, pdf_path=None):
+    """Whether a backend can be used: its module is installed, or the sidecar exists"""
+    if name == "sidecar":
+        return pdf_path is not None and sidecar_path(pdf_path).exists()
+    return importlib.util.find_spec(BACKENDS[name][1]) is not None
+
+def available_backends(pdf_path=None):
+    return [name for name in AUTO_ORDER if backend_available(name, pdf_path)]
+
+def resolve_backend(name, pdf_path):
+    """Concrete backend name for pdf_path; "auto" picks the first available in AUTO_ORDER"""
+    if name != "auto":
+        return name
+    available = available_backends(pdf_path)
+    if not available:
+        raise RuntimeError("No PDF text backend installed (pip install pdfplumber)")
+    return available[0]
+
+def open_pdf_text(pdf_path, backend="pdfplumber"):
+    """Context manager yielding page_texts(start_page=0) for the given backend"""
+    return BACKENDS[resolve_backend(backend, pdf_path)][0](pdf_path)
+
+def write_sidecar(pdf_path, backend):
+    """Extract pdf_path once with backend and save the pages as a .txt sidecar"""
+    path = sidecar_path(pdf_path)
+    with open_pdf_text(pdf_path, backend) as page_texts:
+        text = PAGE_BREAK.join(page_text.replace(PAGE_BREAK, '\n') for _, page_text in page_texts())
+    atomic_write_bytes(path, text.encode('utf-8'))
+    return path
+
+def main():
+    parser = argparse.ArgumentParser(description="List PDF text backends or write .txt sidecars")
+    parser.add_argument("pdf_folder", nargs="?", default="exam_questions with answers")
+    parser.add_argument("--write-sidecars", metavar="BACKEND",
+                        help="extract every PDF with BACKEND and save <name>.txt next to it")
+    args = parser.parse_args()
+    
+    print(f"Installed backends: {', '.join(available_backends()) or 'none'}")
+    if args.write_sidecars:
+        for pdf_file in sorted(Path(args.pdf_folder).glob("*.pdf")):
+            print(f"  {pdf_file.name} -> {write_sidecar(pdf_file, args.write_sidecars).name}")
+
+if __name__ == "__main__":
+    if sys.platform == 'win32':
+        sys.stdout.reconfigure(encoding='utf-8')
+    main()
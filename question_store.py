@@ -0,0 +1,196 @@
+"""
+SQLite question store for all question banks
+Each question is stored whole, alongside indexed columns for certification,
+topic, correctCount, option count and content hash, so scripts can query
+and bulk-update questions in transactions instead of scanning JSON files.
+The JSON banks the frontend fetches are written back with export_banks.
+
+Usage:
+    python question_store.py import   # JSON banks -> questions.db
+    python question_store.py export   # questions.db -> JSON banks
+    python question_store.py stats
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+from pathlib import Path
+
+from bank_io import CERTIFICATION_BANKS, load_bank, question_hash, save_bank
+
+DEFAULT_DB = "questions.db"
+
+# Every bank kept in the store: the four certification banks plus the
+# extraction outputs they were built from
+STORE_BANKS = {
+    **CERTIFICATION_BANKS,
+    'cleaned': 'questions_cleaned.json',
+    'full-backup': 'questions_full_backup.json',
+}
+
+# First matching keyword decides a question's topic
+TOPIC_KEYWORDS = [
+    ('Lambda', ['lambda']),
+    ('API Gateway', ['api gateway']),
+    ('DynamoDB', ['dynamodb']),
+    ('S3', ['s3 ', 's3.', 'bucket']),
+    ('IAM & Security', ['iam', 'kms', 'secrets manager', 'cognito', 'key vault', 'managed identity']),
+    ('Messaging', ['sqs', 'sns', 'eventbridge', 'kinesis', 'service bus', 'event grid', 'event hub']),
+    ('Containers', ['ecs', 'eks', 'fargate', 'container', 'aks', 'kubernetes']),
+    ('CI/CD & IaC', ['codepipeline', 'codebuild', 'codedeploy', 'cloudformation', 'sam ', 'cdk', 'devops', 'arm template', 'bicep']),
+    ('Monitoring', ['cloudwatch', 'x-ray', 'application insights', 'azure monitor']),
+    ('Step Functions', ['step functions']),
+    ('Caching', ['elasticache', 'cache', 'redis']),
+    ('Azure Functions', ['azure functions', 'function app']),
+    ('App Service', ['app service', 'web app']),
+    ('Cosmos DB', ['cosmos db']),
+    ('Azure Storage', ['blob', 'storage account', 'queue storage', 'table storage']),
+    ('Generative AI', ['bedrock', 'foundation model', 'openai', 'prompt', 'llm', 'generative']),
+    ('Machine Learning', ['sagemaker', 'machine learning', 'model', 'training']),
+    ('Vision', ['rekognition', 'computer vision', 'custom vision', 'image', 'face']),
+    ('Language & Speech', ['comprehend', 'translate', 'polly', 'transcribe', 'amazon lex', 'language', 'speech', 'text analytics', 'chatbot', 'bot service']),
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS questions (
+    id INTEGER PRIMARY KEY,
+    certification TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    topic TEXT NOT NULL,
+    correct_count INTEGER NOT NULL,
+    option_count INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    data TEXT NOT NULL,
+    UNIQUE (certification, position)
+);
+CREATE INDEX IF NOT EXISTS idx_questions_topic ON questions (certification, topic);
+CREATE INDEX IF NOT EXISTS idx_questions_correct_count ON questions (certification, correct_count);
+CREATE INDEX IF NOT EXISTS idx_questions_option_count ON questions (certification, option_count);
+CREATE INDEX IF NOT EXISTS idx_questions_content_hash ON questions (content_hash);
+"""
+
+def infer_topic(q):
+    text = q.get('question', '').lower()
+    for topic, keywords in TOPIC_KEYWORDS:
+        if any(keyword in text for keyword in keywords):
+            return topic
+    return 'General'
+
+def indexed_columns(q):
+    """(topic, correct_count, option_count, content_hash, data) for a question"""
+    answer = q.get('answer')
+    correct_count = q.get('correctCount', len(answer) if isinstance(answer, list) else 1)
+    return (
+        q.get('topic') or infer_topic(q),
+        correct_count,
+        len(q.get('options', [])),
+        question_hash(q),
+        json.dumps(q, ensure_ascii=False),
+    )
+
+def connect(db_path=DEFAULT_DB):
+    conn = sqlite3.connect(db_path)
+    conn.executescript(SCHEMA)
+    return conn
+
+def import_bank(conn, certification, questions):
+    """Replace a certification's questions with the given list, in one transaction"""
+    rows = [(certification, position) + indexed_columns(q) for position, q in enumerate(questions)]
+    with conn:
+        conn.execute("DELETE FROM questions WHERE certification = ?", (certification,))
+        conn.executemany(
+            "INSERT INTO questions (certification, position, topic, correct_count, option_count, content_hash, data) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+    return len(rows)
+
+def import_banks(conn, banks=STORE_BANKS):
+    counts = {}
+    for certification, filepath in banks.items():
+        if Path(filepath).exists():
+            counts[certification] = import_bank(conn, certification, load_bank(filepath))
+    return counts
+
+def export_bank(conn, certification, filepath):
+    rows = conn.execute("SELECT data FROM questions WHERE certification = ? ORDER BY position",
+                        (certification,))
+    questions = [json.loads(data) for (data,) in rows]
+    save_bank(questions, filepath)
+    return len(questions)
+
+def export_banks(conn, banks=STORE_BANKS):
+    """Write every stored certification back to the JSON files app.js fetches"""
+    counts = {}
+    for certification, filepath in banks.items():
+        if conn.execute("SELECT 1 FROM questions WHERE certification = ? LIMIT 1", (certification,)).fetchone():
+            counts[certification] = export_bank(conn, certification, filepath)
+    return counts
+
+def find_questions(conn, certification=None, topic=None, correct_count=None,
+                   max_options=None, min_options=None, content_hash=None):
+    """Indexed lookup; returns [(id, certification, position, question)] in bank order"""
+    clauses, params = [], []
+    for column, value in [('certification', certification), ('topic', topic),
+                          ('correct_count', correct_count), ('content_hash', content_hash)]:
+        if value is not None:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    if max_options is not None:
+        clauses.append("option_count <= ?")
+        params.append(max_options)
+    if min_options is not None:
+        clauses.append("option_count >= ?")
+        params.append(min_options)
+    
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    rows = conn.execute(f"SELECT id, certification, position, data FROM questions {where} "
+                        f"ORDER BY certification, position", params)
+    return [(row_id, cert, position, json.loads(data)) for row_id, cert, position, data in rows]
+
+def update_questions(conn, updates):
+    """Bulk-replace questions given [(id, question)], refreshing the indexed columns atomically"""
+    rows = [indexed_columns(q) + (row_id,) for row_id, q in updates]
+    with conn:
+        conn.executemany(
+            "UPDATE questions SET topic = ?, correct_count = ?, option_count = ?, content_hash = ?, data = ? "
+            "WHERE id = ?", rows)
+    return len(rows)
+
+# Indexed columns that can be grouped on
+DISTRIBUTION_COLUMNS = ('topic', 'correct_count', 'option_count')
+
+def distribution(conn, column):
+    """{certification: {value: questions}} for an indexed column, counted inside SQLite"""
+    if column not in DISTRIBUTION_COLUMNS:
+        raise ValueError(f"Cannot group on {column!r}; expected one of {DISTRIBUTION_COLUMNS}")
+    counts = {}
+    rows = conn.execute(f"SELECT certification, {column}, COUNT(*) FROM questions "
+                        f"GROUP BY certification, {column} ORDER BY certification, {column}")
+    for certification, value, count in rows:
+        counts.setdefault(certification, {})[value] = count
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite store for the question banks")
+    parser.add_argument("command", choices=["import", "export", "stats"])
+    parser.add_argument("--db", default=DEFAULT_DB, help=f"database file (default: {DEFAULT_DB})")
+    args = parser.parse_args()
+    
+    conn = connect(args.db)
+    if args.command == "import":
+        for certification, count in import_banks(conn).items():
+            print(f"  Imported {count} questions into {certification}")
+    elif args.command == "export":
+        for certification, count in export_banks(conn).items():
+            print(f"  Exported {count} questions to {STORE_BANKS[certification]}")
+    else:
+        for certification, topics in distribution(conn, 'topic').items():
+            print(f"\n{certification} ({sum(topics.values())} questions)")
+            for topic, count in sorted(topics.items(), key=lambda item: -item[1]):
+                print(f"  {topic:<20} {count}")
+    conn.close()
+
+if __name__ == "__main__":
+    if sys.platform == 'win32':
+        sys.stdout.reconfigure(encoding='utf-8')
+    main()
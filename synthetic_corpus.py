@@ -0,0 +1,170 @@
+"""
+Synthetic question banks and exam dump text at scale
+Produces realistic-looking questions (scenario stems, 3-6 service options,
+single and multi-answer keys, a share of near-duplicates) plus the raw
+forms the pipeline starts from: watermarked extraction output for
+clean_questions and "NEW QUESTION n" page text for extract_full.
+Output is deterministic for a given size and seed.
+
+Usage:
+    python synthetic_corpus.py --sizes 10000 100000 1000000 --output-dir synthetic
+"""
+
+import argparse
+import random
+import sys
+from pathlib import Path
+
+from bank_io import save_bank
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+SERVICES = {
+    'AWS': ["AWS Lambda", "Amazon DynamoDB", "Amazon S3", "Amazon API Gateway", "Amazon SQS", "Amazon SNS",
+            "Amazon Kinesis Data Streams", "AWS Step Functions", "Amazon ElastiCache", "Amazon ECS",
+            "AWS Fargate", "Amazon CloudWatch", "AWS X-Ray", "Amazon Cognito", "AWS KMS",
+            "AWS Secrets Manager", "AWS CodePipeline", "AWS CloudFormation", "Amazon EventBridge",
+            "Amazon SageMaker", "Amazon Bedrock", "Amazon Comprehend", "Amazon Rekognition", "Amazon RDS"],
+    'Azure': ["Azure Functions", "Azure Cosmos DB", "Azure Blob Storage", "Azure API Management",
+              "Azure Service Bus", "Azure Event Grid", "Azure Event Hubs", "Azure Logic Apps",
+              "Azure Cache for Redis", "Azure Kubernetes Service", "Azure Container Apps", "Azure Monitor",
+              "Application Insights", "Microsoft Entra ID", "Azure Key Vault", "Azure App Configuration",
+              "Azure DevOps Pipelines", "Azure Resource Manager templates", "Azure Machine Learning",
+              "Azure OpenAI Service", "Azure AI Language", "Azure AI Vision", "Azure SQL Database"],
+}
+COMPANIES = ["A retail company", "A healthcare startup", "A media streaming service", "A logistics provider",
+             "A financial services firm", "An online game studio", "A university", "A travel booking site",
+             "A manufacturing company", "An insurance company", "A news publisher", "A SaaS vendor"]
+TASKS = ["process uploaded images", "store user session data", "decouple order processing",
+         "stream clickstream events", "run scheduled batch jobs", "expose a REST API to partners",
+         "rotate database credentials", "trace requests across microservices", "cache product catalog reads",
+         "orchestrate a multi-step approval workflow", "classify customer support tickets",
+         "deploy containerized services", "analyze sentiment in reviews", "authenticate mobile users"]
+CONSTRAINTS = ["with the least operational overhead", "at the lowest cost", "with single-digit millisecond latency",
+               "without managing servers", "while meeting compliance requirements", "with automatic scaling",
+               "with minimal code changes", "across multiple Regions"]
+ACTIONS = ["handle the workload", "store the data durably", "trigger the processing step", "manage the secrets",
+           "buffer incoming requests", "monitor the application", "scale with demand", "serve the results"]
+EXPLANATIONS = ["{service} is the managed service designed for this use case, so it meets the requirement {constraint}.",
+                "{service} integrates natively with the rest of the architecture and scales automatically.",
+                "Only {service} satisfies the latency and durability requirements described in the scenario."]
+
+# Watermarks and damage seen in real dump text, for the raw clean_questions input
+WATERMARKS = ["Passing Certification Exams Made Easy visit - https://www.surepassexam.com",
+              "Recommend!! Get the Full DVA-C02 dumps in VCE and PDF From SurePassExam (127 New Questions)",
+              "Your Partner of IT Exam visit - https://www.exambible.com (127 New Questions)"]
+
+def synthetic_question(rng, number):
+    """One clean question; about 1 in 8 has too few options and 3 in 10 have several answers"""
+    provider = rng.choice(list(SERVICES))
+    services = rng.sample(SERVICES[provider], 6)
+    constraint = rng.choice(CONSTRAINTS)
+    question = (f"{rng.choice(COMPANIES)} needs to {rng.choice(TASKS)} for about {rng.randint(2, 900) * 100} "
+                f"requests per minute {constraint}. Which solution meets these requirements? "
+                f"(Scenario {number})")
+    
+    option_count = rng.choice([3, 4, 4, 4, 5, 5, 6, 6])
+    options = [f"Use {service} to {rng.choice(ACTIONS)}" for service in services[:option_count]]
+    correct = rng.choices([1, 2, 3], weights=[7, 2, 1])[0] if option_count >= 5 else 1
+    answers = options[:correct]
+    rng.shuffle(options)
+    
+    q = {
+        "question": question,
+        "options": options,
+        "answer": answers[0] if correct == 1 else answers,
+        "explanation": rng.choice(EXPLANATIONS).format(service=services[0], constraint=constraint),
+    }
+    if correct > 1:
+        q["correctCount"] = correct
+    return q
+
+def generate_bank(size, seed=0, duplicate_rate=0.05):
+    """size questions; duplicate_rate of them are lightly edited copies of earlier ones"""
+    rng = random.Random(seed)
+    questions = []
+    for number in range(1, size + 1):
+        if questions and rng.random() < duplicate_rate:
+            original = rng.choice(questions)
+            copy = dict(original, options=list(original["options"]))
+            copy["question"] = original["question"].replace("Which solution", "Which option")
+            rng.shuffle(copy["options"])
+            questions.append(copy)
+        else:
+            questions.append(synthetic_question(rng, number))
+    return questions
+
+def raw_question(rng, q):
+    """q as an extraction might have produced it: watermarks, truncations and junk options"""
+    def damage(text):
+        if rng.random() < 0.2:
+            text = f"{text} {rng.choice(WATERMARKS)}"
+        if rng.random() < 0.05:
+            text = text.replace("function ", "functio ", 1)
+        return text
+    
+    answer = q["answer"] if isinstance(q["answer"], str) else q["answer"][0]
+    options = [damage(option) for option in q["options"]]
+    if rng.random() < 0.1:
+        options.append("Mastered")
+    return {
+        "question": damage(q["question"]),
+        "options": options,
+        "answer": damage(answer),
+        "explanation": damage(q["explanation"]),
+    }
+
+def generate_raw_questions(size, seed=0):
+    rng = random.Random(seed + 1)
+    return [raw_question(rng, q) for q in generate_bank(size, seed)]
+
+def iter_dump_pages(questions, per_page=3):
+    """Exam dump page texts in the "NEW QUESTION n" layout extract_full parses"""
+    page = []
+    for number, q in enumerate(questions, 1):
+        answers = q["answer"] if isinstance(q["answer"], list) else [q["answer"]]
+        letters = "".join(chr(ord('A') + q["options"].index(answer)) for answer in answers)
+        lines = [f"NEW QUESTION {number}", q["question"]]
+        lines += [f"{chr(ord('A') + i)}. {option}" for i, option in enumerate(q["options"])]
+        lines += [f"Answer: {letters}", "Explanation:", q["explanation"], ""]
+        page.append("\n".join(lines))
+        if len(page) == per_page:
+            yield "\n".join(page)
+            page = []
+    if page:
+        yield "\n".join(page)
+
+def write_corpus(size, output_dir, seed=0):
+    """Write bank_<size>.json, raw_<size>.json and dump_<size>.txt; returns their paths"""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    bank = generate_bank(size, seed)
+    
+    paths = {
+        "bank": output_dir / f"bank_{size}.json",
+        "raw": output_dir / f"raw_{size}.json",
+        "dump": output_dir / f"dump_{size}.txt",
+    }
+    save_bank(bank, paths["bank"])
+    save_bank(generate_raw_questions(size, seed), paths["raw"])
+    with open(paths["dump"], 'w', encoding='utf-8') as f:
+        # Form feeds separate pages, as in pdf_backends sidecars
+        f.write("\f".join(iter_dump_pages(bank)))
+    return paths
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic question banks and dump text")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--output-dir", default="synthetic")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    
+    for size in args.sizes:
+        paths = write_corpus(size, args.output_dir, args.seed)
+        sizes = ", ".join(f"{path.name} {path.stat().st_size / 1e6:.1f} MB" for path in paths.values())
+        print(f"  {size:>9,} questions: {sizes}")
+
+if __name__ == "__main__":
+    if sys.platform == 'win32':
+        sys.stdout.reconfigure(encoding='utf-8')
+    main()
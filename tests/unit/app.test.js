@@ -307,3 +307,28 @@ describe('Edge Cases and Error Handling', () => {
   });
 });
 
+
+describe('Answer Keys', () => {
+  const { getAnswerIndices, isAnswerCorrect } = require('../../app.js');
+
+  test('should key each answer to its option index', () => {
+    expect(getAnswerIndices({ options: ['A1', 'B1', 'C1', 'D1'], answer: 'C1' })).toEqual([2]);
+    expect(getAnswerIndices({ options: ['A1', 'B1', 'C1', 'D1'], answer: ['D1', 'B1'] })).toEqual([1, 3]);
+    expect(getAnswerIndices({ options: ['A1', ' B1 ', 'C1', 'D1'], answer: 'B1' })).toEqual([1]);
+  });
+
+  test('should key a repeated option to its first copy, as answer_keys.py does', () => {
+    const question = {
+      options: ['App Service', 'Functions', 'Logic Apps', 'Event Grid', 'Service Bus', 'App Service'],
+      answer: 'App Service'
+    };
+
+    expect(getAnswerIndices(question)).toEqual([0]);
+    expect(isAnswerCorrect(question, [0])).toBe(true);
+    expect(isAnswerCorrect(question, [0, 5])).toBe(false);
+  });
+
+  test('should keep precomputed answer indices', () => {
+    expect(getAnswerIndices({ options: ['A1', 'B1'], answer: 'A1', answerIndices: [1] })).toEqual([1]);
+  });
+});
@@ -3,9 +3,10 @@ Upgrade AWS AI questions to professional AWS Solutions Architect level
 Replace generic questions with real-world scenario-based questions
 """
 
-import json
 import sys
 
+from bank_io import load_bank, save_bank
+
 if sys.platform == 'win32':
     import io
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
@@ -15,8 +16,7 @@ print("UPGRADING AWS AI QUESTIONS TO PROFESSIONAL LEVEL")
 print("="*70)
 
 # Load professional questions
-with open('professional_aws_ai_questions.json', 'r', encoding='utf-8') as f:
-    professional_questions = json.load(f)
+professional_questions = load_bank('professional_aws_ai_questions.json')
 
 print(f"\nLoaded {len(professional_questions)} professional-grade questions")
 print("\nSample professional questions:")
@@ -25,8 +25,7 @@ for i, q in enumerate(professional_questions[:3]):
     print(f"       Options: {len(q['options'])}, Correct: {q['correctCount']}")
 
 # Load existing AWS AI questions
-with open('questions_aws_ai.json', 'r', encoding='utf-8') as f:
-    existing_questions = json.load(f)
+existing_questions = load_bank('questions_aws_ai.json')
 
 print(f"\n\nCurrent AWS AI bank: {len(existing_questions)} questions")
 
@@ -43,8 +42,7 @@ print(f"  - Professional questions: {len(professional_questions)}")
 print(f"  - Remaining questions: {max(0, len(upgraded_questions) - len(professional_questions))}")
 
 # Save upgraded questions
-with open('questions_aws_ai.json', 'w', encoding='utf-8') as f:
-    json.dump(upgraded_questions, f, indent=2, ensure_ascii=False)
+save_bank(upgraded_questions, 'questions_aws_ai.json')
 
 print("\n" + "="*70)
 print("AWS AI QUESTIONS UPGRADED!")
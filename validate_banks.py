@@ -0,0 +1,228 @@
+"""
+Validate every question bank in one pass per question
+Checks structure, 4-6 options, that each answer is one of the options,
+that correctCount matches the number of answers, and duplicate options.
+Banks are validated in parallel; exits non-zero if any question fails.
+
+Verdicts are cached per question content hash in <bank>.validation.json,
+so only new or edited questions are re-checked, and an unchanged bank is
+not parsed at all; --full ignores the cache.
+
+Usage:
+    python validate_banks.py [--report validation_report.json] [--workers N] [--full]
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from answer_keys import answer_indices
+from bank_io import CERTIFICATION_BANKS, atomic_write_text, dumps, load_bank, loads, question_hash
+
+REQUIRED_KEYS = ('question', 'options', 'answer', 'explanation')
+MIN_OPTIONS = 4
+MAX_OPTIONS = 6  # A-F in the quiz
+CHECKS = ('structure', 'option_count', 'answer_in_options', 'correct_count', 'duplicate_options')
+# Bump when validate_question or the result format changes so cached verdicts are discarded
+RULES_VERSION = f"2:{MIN_OPTIONS}-{MAX_OPTIONS}"
+
+def cache_path(bank_file):
+    bank_file = Path(bank_file)
+    return bank_file.with_name(bank_file.name + '.validation.json')
+
+def load_cache(bank_file):
+    """The bank's validation cache, or {} if missing or written under other rules"""
+    try:
+        with open(cache_path(bank_file), 'rb') as f:
+            cache = loads(f.read())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or cache.get("rules") != RULES_VERSION:
+        return {}
+    return cache
+
+def save_cache(bank_file, bank_sha256, result, verdicts):
+    cache = {"rules": RULES_VERSION, "bank_sha256": bank_sha256, "result": result, "verdicts": verdicts}
+    atomic_write_text(cache_path(bank_file), dumps(cache, compact=True))
+
+def validate_question(q):
+    """[(check, message)] for everything wrong with one question"""
+    if not isinstance(q, dict):
+        return [('structure', "not a JSON object")]
+    problems = []
+    
+    missing = [key for key in REQUIRED_KEYS if key not in q]
+    if missing:
+        problems.append(('structure', f"missing {', '.join(missing)}"))
+    text = q.get('question')
+    if 'question' in q and (not isinstance(text, str) or not text.strip()):
+        problems.append(('structure', "question text is empty"))
+    
+    options = q.get('options')
+    if not isinstance(options, list) or not all(isinstance(option, str) for option in options):
+        if 'options' in q:
+            problems.append(('structure', "options must be a list of strings"))
+        return problems
+    if not MIN_OPTIONS <= len(options) <= MAX_OPTIONS:
+        problems.append(('option_count', f"{len(options)} options, expected {MIN_OPTIONS}-{MAX_OPTIONS}"))
+    seen = set()
+    for option in options:
+        normalized = ' '.join(option.split()).lower()
+        if normalized in seen:
+            problems.append(('duplicate_options', f"duplicate option {option!r}"))
+        seen.add(normalized)
+    
+    answer = q.get('answer')
+    if isinstance(answer, list):
+        answers = answer
+    else:
+        answers = [] if answer in (None, '') else [answer]
+    if not all(isinstance(item, str) for item in answers):
+        problems.append(('structure', "answer must be a string or a list of strings"))
+        return problems
+    if not answers:
+        if 'answer' in q:
+            problems.append(('answer_in_options', "no answer"))
+        return problems
+    
+    indices, unmatched = answer_indices(q)
+    for item in unmatched:
+        problems.append(('answer_in_options', f"answer {item!r} is not one of the options"))
+    expected = q.get('correctCount', 1)
+    if expected != len(answers):
+        problems.append(('correct_count', f"correctCount is {expected} but there are {len(answers)} answers"))
+    elif not unmatched and len(indices) != len(answers):
+        problems.append(('correct_count', "answers repeat the same option"))
+    return problems
+
+def validate_bank(bank_file, full=False):
+    """Load bank_file once and validate it; returns a JSON-serializable result.
+    
+    Unless full is set, an unchanged bank reuses its cached result and any
+    question whose content hash has a cached verdict reuses it. The cache is
+    rewritten with the verdicts of the current questions.
+    """
+    cache = {} if full else load_cache(bank_file)
+    try:
+        bank_sha256 = hashlib.sha256(Path(bank_file).read_bytes()).hexdigest()
+    except OSError:
+        bank_sha256 = None
+    if bank_sha256 is not None and cache.get("bank_sha256") == bank_sha256 and "result" in cache:
+        return dict(cache["result"], file=str(bank_file), checked=0, reused=cache["result"]["questions"])
+    
+    counts = dict.fromkeys(CHECKS, 0)
+    problems = []
+    try:
+        questions = load_bank(bank_file)
+    except (OSError, ValueError) as e:
+        questions = []
+        problems.append({"question": None, "check": "structure", "message": f"cannot load bank: {e}"})
+        counts['structure'] += 1
+    
+    if not isinstance(questions, list):
+        problems.append({"question": None, "check": "structure", "message": "bank is not a JSON array"})
+        counts['structure'] += 1
+        questions = []
+    
+    cached = cache.get("verdicts", {})
+    verdicts = {}
+    checked = 0
+    # Questions per option count, for verify_options_count (string keys, as JSON stores them)
+    option_counts = {}
+    for i, q in enumerate(questions):
+        if isinstance(q, dict) and isinstance(q.get('options'), list):
+            option_count = str(len(q['options']))
+            option_counts[option_count] = option_counts.get(option_count, 0) + 1
+        key = question_hash(q)
+        if key in verdicts:
+            question_problems = verdicts[key]
+        elif key in cached:
+            question_problems = verdicts[key] = cached[key]
+        else:
+            question_problems = verdicts[key] = validate_question(q)
+            checked += 1
+        for check, message in question_problems:
+            problems.append({"question": i + 1, "check": check, "message": message})
+            counts[check] += 1
+    
+    failed_questions = len({problem["question"] for problem in problems if problem["question"] is not None})
+    result = {
+        "file": str(bank_file),
+        "questions": len(questions),
+        "checked": checked,
+        "reused": len(questions) - checked,
+        "failed_questions": failed_questions,
+        "passed": not problems,
+        "counts": counts,
+        "option_counts": option_counts,
+        "problems": problems,
+    }
+    if questions:
+        save_cache(bank_file, bank_sha256, result, verdicts)
+    return result
+
+def validate_banks(banks=CERTIFICATION_BANKS, workers=1, full=False):
+    """Validate {name: bank file} with up to workers processes; returns the full report"""
+    names = list(banks)
+    files = [banks[name] for name in names]
+    if workers > 1 and len(files) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(files))) as pool:
+            results = list(pool.map(validate_bank, files, [full] * len(files)))
+    else:
+        results = [validate_bank(bank_file, full) for bank_file in files]
+    
+    totals = dict.fromkeys(CHECKS, 0)
+    for result in results:
+        for check, count in result["counts"].items():
+            totals[check] += count
+    return {
+        "passed": all(result["passed"] for result in results),
+        "totals": totals,
+        "banks": dict(zip(names, results)),
+    }
+
+def main():
+    if sys.platform == 'win32':
+        sys.stdout.reconfigure(encoding='utf-8')
+    parser = argparse.ArgumentParser(description="Validate question banks in a single pass per question")
+    parser.add_argument("banks", nargs="*", help="bank files (default: the four certification banks)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="banks validated in parallel (default: CPU count)")
+    parser.add_argument("--report", help="write the full JSON report to this file")
+    parser.add_argument("--show", type=int, default=5, help="problems printed per bank (default: 5)")
+    parser.add_argument("--full", action="store_true", help="re-check every question, ignoring cached verdicts")
+    args = parser.parse_args()
+    
+    banks = {bank_file: bank_file for bank_file in args.banks} if args.banks else CERTIFICATION_BANKS
+    report = validate_banks(banks, args.workers, args.full)
+    
+    print("="*70)
+    print("QUESTION BANK VALIDATION")
+    print("="*70)
+    for name, result in report["banks"].items():
+        status = "✓ PASS" if result["passed"] else f"✗ FAIL ({result['failed_questions']} questions failed)"
+        print(f"\n{name} - {result['questions']} questions ({result['checked']} checked, "
+              f"{result['reused']} reused) - {status}")
+        for problem in result["problems"][:args.show]:
+            where = f"Q{problem['question']}" if problem["question"] is not None else "bank"
+            print(f"  {where}: [{problem['check']}] {problem['message']}")
+        if len(result["problems"]) > args.show:
+            print(f"  ... {len(result['problems']) - args.show} more")
+    
+    print("\n" + "="*70)
+    for check, count in report["totals"].items():
+        print(f"  {check:<18} {count} problems")
+    print("="*70)
+    
+    if args.report:
+        atomic_write_text(args.report, dumps(report) + '\n')
+        print(f"Report written to {args.report}")
+    
+    if not report["passed"]:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,54 +1,84 @@
 """
 Verify all questions have 4-6 answer options
+The JSON banks are checked through validate_banks, so only new or edited
+questions are looked at again; --full re-checks every question.
 """
-import json
+import argparse
 import sys
 
-if sys.platform == 'win32':
-    import io
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+from bank_io import CERTIFICATION_BANKS
+from question_store import connect, distribution, find_questions
+from validate_banks import MAX_OPTIONS, MIN_OPTIONS, validate_bank
 
-files = {
-    'AWS Developer': 'questions_aws_developer.json',
-    'AWS AI': 'questions_aws_ai.json',
-    'Azure Developer': 'questions_azure_developer.json',
-    'Azure AI': 'questions_azure_ai.json'
+certifications = {
+    'AWS Developer': 'aws-developer',
+    'AWS AI': 'aws-ai',
+    'Azure Developer': 'azure-developer',
+    'Azure AI': 'azure-ai'
 }
 
-print("="*70)
-print("VERIFYING ANSWER OPTIONS COUNT")
-print("="*70)
+def scan_bank(bank_file, full=False):
+    """(total, {option count: questions}, [(position, problem)] outside 4-6) from the bank's validation verdicts"""
+    result = validate_bank(bank_file, full)
+    option_counts = {int(count): n for count, n in result['option_counts'].items()}
+    issues = [(problem['question'] - 1, problem['message'])
+              for problem in result['problems'] if problem['check'] == 'option_count']
+    return result['questions'], option_counts, issues
 
-all_good = True
-for name, filepath in files.items():
-    with open(filepath, 'r', encoding='utf-8') as f:
-        questions = json.load(f)
+def scan_store(conn, cert_id):
+    """Same summary answered by the store's option-count index without loading every question"""
+    option_counts = distribution(conn, 'option_count').get(cert_id, {})
+    rows = (find_questions(conn, certification=cert_id, max_options=MIN_OPTIONS - 1) +
+            find_questions(conn, certification=cert_id, min_options=MAX_OPTIONS + 1))
+    issues = [(position, f"{len(q.get('options', []))} options, expected {MIN_OPTIONS}-{MAX_OPTIONS}")
+              for _, _, position, q in sorted(rows, key=lambda row: row[2])]
+    return sum(option_counts.values()), option_counts, issues
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify all questions have 4-6 answer options")
+    parser.add_argument("--db", help="check this SQLite store (see question_store.py) instead of the JSON banks")
+    parser.add_argument("--full", action="store_true", help="re-check every question, ignoring cached verdicts")
+    args = parser.parse_args()
     
-    # Check options count
-    option_counts = {}
-    issues = 0
-    for i, q in enumerate(questions):
-        opt_count = len(q.get('options', []))
-        option_counts[opt_count] = option_counts.get(opt_count, 0) + 1
-        if opt_count < 4:
-            print(f"\nISSUE in {name}, Q{i+1}: Only {opt_count} options!")
-            issues += 1
-            all_good = False
+    if args.db:
+        conn = connect(args.db)
+        
+        def scan(cert_id):
+            return scan_store(conn, cert_id)
+    else:
+        def scan(cert_id):
+            return scan_bank(CERTIFICATION_BANKS[cert_id], args.full)
     
-    print(f"\n{name} ({len(questions)} questions)")
-    print(f"  Option distribution:")
-    for count in sorted(option_counts.keys()):
-        print(f"    {count} options: {option_counts[count]} questions")
+    print("="*70)
+    print("VERIFYING ANSWER OPTIONS COUNT")
+    print("="*70)
     
-    if issues == 0:
-        print(f"  ✓ All questions have 4+ options")
+    all_good = True
+    for name, cert_id in certifications.items():
+        total, option_counts, issues = scan(cert_id)
+        
+        for i, problem in issues:
+            print(f"\nISSUE in {name}, Q{i+1}: {problem}")
+            all_good = False
+        
+        print(f"\n{name} ({total} questions)")
+        print(f"  Option distribution:")
+        for count in sorted(option_counts.keys()):
+            print(f"    {count} options: {option_counts[count]} questions")
+        
+        if not issues:
+            print(f"  ✓ All questions have 4-6 options")
+        else:
+            print(f"  ✗ {len(issues)} questions need fixing")
+    
+    print("\n" + "="*70)
+    if all_good:
+        print("✓ SUCCESS: All 1,200 questions have 4-6 answer options!")
     else:
-        print(f"  ✗ {issues} questions need fixing")
-
-print("\n" + "="*70)
-if all_good:
-    print("✓ SUCCESS: All 1,200 questions have 4-6 answer options!")
-else:
-    print("✗ ISSUES FOUND: Some questions still need fixing")
-print("="*70)
+        print("✗ ISSUES FOUND: Some questions still need fixing")
+    print("="*70)
 
+if __name__ == "__main__":
+    if sys.platform == 'win32':
+        sys.stdout.reconfigure(encoding='utf-8')
+    main()
@@ -1,9 +1,7 @@
-import json
+import argparse
 import sys
 
-if sys.platform == 'win32':
-    import io
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+from validate_banks import validate_bank
 
 files = [
     'questions_aws_developer.json',
@@ -12,36 +10,39 @@ files = [
     'questions_azure_ai.json'
 ]
 
-print("="*70)
-print("QUESTION BANK VERIFICATION")
-print("="*70)
-
-total = 0
-for f in files:
-    try:
-        with open(f, 'r', encoding='utf-8') as file:
-            questions = json.load(file)
-            count = len(questions)
-            total += count
-            print(f"\n{f}")
-            print(f"  Questions: {count}")
-            print(f"  Status: {'OK' if count == 300 else 'CHECK'}")
-            
-            # Verify structure
-            if count > 0:
-                sample = questions[0]
-                required_keys = ['question', 'options', 'answer', 'explanation']
-                has_all_keys = all(key in sample for key in required_keys)
-                print(f"  Structure: {'VALID' if has_all_keys else 'INVALID'}")
-    except Exception as e:
+def main():
+    if sys.platform == 'win32':
+        sys.stdout.reconfigure(encoding='utf-8')
+    parser = argparse.ArgumentParser(description="Count and structurally verify the question banks")
+    parser.add_argument("--full", action="store_true", help="re-check every question, ignoring cached verdicts")
+    args = parser.parse_args()
+    
+    print("="*70)
+    print("QUESTION BANK VERIFICATION")
+    print("="*70)
+    
+    total = 0
+    for f in files:
+        # Every question is checked; unchanged ones reuse their cached verdict
+        result = validate_bank(f, args.full)
+        load_errors = [problem for problem in result['problems'] if problem['question'] is None]
         print(f"\n{f}")
-        print(f"  ERROR: {e}")
-
-print("\n" + "="*70)
-print(f"TOTAL QUESTIONS: {total}")
-print("="*70)
-print(f"\nTarget per certification: 300")
-print(f"Target total: 1,200")
-print(f"Achievement: {total / 1200 * 100:.1f}%")
-print("\nSTATUS: {'SUCCESS' if total >= 1200 else 'IN PROGRESS'}")
+        if load_errors:
+            print(f"  ERROR: {load_errors[0]['message']}")
+            continue
+        count = result['questions']
+        total += count
+        print(f"  Questions: {count}")
+        print(f"  Status: {'OK' if count == 300 else 'CHECK'}")
+        print(f"  Structure: {'VALID' if result['counts']['structure'] == 0 else 'INVALID'}")
+    
+    print("\n" + "="*70)
+    print(f"TOTAL QUESTIONS: {total}")
+    print("="*70)
+    print(f"\nTarget per certification: 300")
+    print(f"Target total: 1,200")
+    print(f"Achievement: {total / 1200 * 100:.1f}%")
+    print("\nSTATUS: {'SUCCESS' if total >= 1200 else 'IN PROGRESS'}")
 
+if __name__ == "__main__":
+    main()